@@ -0,0 +1,64 @@
+"""Scaling benchmark: legacy per-county loop vs vectorized `score_weekly`.
+
+    python benchmarks/bench_scoring.py [--weeks 60] [--sizes 3 87 1000 10000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from mn_ews.scoring import make_overview  # noqa: E402
+from mn_ews.synthetic import generate_weekly  # noqa: E402
+
+
+def legacy_overview(weekly_df):
+    # The pre-vectorization implementation, kept verbatim for comparison.
+    latest = weekly_df.groupby("county").tail(8).copy()
+    probs = []
+    for c, grp in latest.groupby("county"):
+        x = grp["Food_Shelf_Visits"]
+        mu, sd = x.mean(), x.std(ddof=1) if x.std(ddof=1)>0 else 1.0
+        z = (x.iloc[-1] - mu)/sd
+        p = float(1/(1+np.exp(-z)))
+        probs.append({"County": c, "Prob_Spike_8w": p})
+    df = pd.DataFrame(probs).sort_values("Prob_Spike_8w", ascending=False)
+    def rag(p): return "Red" if p>0.60 else "Amber" if p>=0.30 else "Green"
+    df["RAG_Status"] = df["Prob_Spike_8w"].apply(rag)
+    df["As_Of_Date"] = str(pd.to_datetime(weekly_df["date"]).max().date())
+    df["Lead_Time_Weeks"] = 8
+    return df
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(); best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--weeks", type=int, default=60)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[3, 87, 1000, 10000])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--legacy-max", type=int, default=10000, help="skip the legacy loop above this size")
+    args = ap.parse_args(argv)
+
+    print(f"{'series':>8} {'rows':>10} {'legacy_s':>10} {'vector_s':>10} {'speedup':>8}")
+    for n in args.sizes:
+        df = generate_weekly(n, args.weeks)
+        vec = best_of(lambda: make_overview(df), args.repeat)
+        leg = best_of(lambda: legacy_overview(df), args.repeat) if n <= args.legacy_max else float("nan")
+        if n <= args.legacy_max:
+            a = legacy_overview(df).set_index("County")["Prob_Spike_8w"].sort_index()
+            b = make_overview(df).set_index("County")["Prob_Spike_8w"].sort_index()
+            assert np.allclose(a.to_numpy(), b.to_numpy()), "vectorized scores diverge from legacy loop"
+        print(f"{n:>8} {len(df):>10} {leg:>10.4f} {vec:>10.4f} {leg / vec:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
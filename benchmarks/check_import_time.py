@@ -0,0 +1,67 @@
+"""Import-time budget for the `mn_ews` core, measured in fresh interpreters.
+
+    python benchmarks/check_import_time.py [--budget-ms 50] [--entry-budget-ms 100]
+
+Exits non-zero when `import mn_ews` exceeds the budget, when an entry point
+batch jobs import (`mn_ews.data`, `mn_ews.batch`) costs more than
+`--entry-budget-ms` on top of a bare `import pandas` in the same environment,
+or when importing the library modules drags in Streamlit, matplotlib or
+reportlab.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+HEAVY = ("streamlit", "matplotlib", "reportlab")
+MODULES = ["mn_ews", "mn_ews.scoring", "mn_ews.data", "mn_ews.batch", "mn_ews.overrides", "mn_ews.report"]
+ENTRY_POINTS = ["mn_ews.data", "mn_ews.batch"]  # what cron/batch jobs import; budgeted relative to pandas
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t0
+print(json.dumps({{"seconds": elapsed, "heavy": sorted(m for m in {heavy!r} if m in sys.modules)}}))
+"""
+
+
+def measure(module, repeat=5):
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY)],
+                             cwd=ROOT, capture_output=True, text=True, check=True)
+        runs.append(json.loads(out.stdout))
+    return min(r["seconds"] for r in runs), runs[0]["heavy"]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--budget-ms", type=float, default=50.0, help="budget for bare `import mn_ews`")
+    ap.add_argument("--entry-budget-ms", type=float, default=100.0,
+                    help="budget for each entry point over the `import pandas` baseline")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    failures = []
+    baseline, _ = measure("pandas", args.repeat)
+    print(f"{'pandas (baseline)':<20} {baseline * 1000:8.1f} ms")
+    for module in MODULES:
+        seconds, heavy = measure(module, args.repeat)
+        extra = (seconds - baseline) * 1000
+        print(f"{module:<20} {seconds * 1000:8.1f} ms   {extra:+8.1f} ms vs pandas   heavy: {', '.join(heavy) or '-'}")
+        if heavy:
+            failures.append(f"{module} imports {', '.join(heavy)} eagerly")
+        if module == "mn_ews" and seconds * 1000 > args.budget_ms:
+            failures.append(f"import mn_ews took {seconds * 1000:.1f} ms (budget {args.budget_ms:.0f} ms)")
+        if module in ENTRY_POINTS and extra > args.entry_budget_ms:
+            failures.append(f"import {module} took {extra:.1f} ms over pandas (budget {args.entry_budget_ms:.0f} ms)")
+    for f in failures:
+        print("FAIL:", f)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Load test for the JSON API: requests/sec and latency for full and conditional (ETag) polling.
+
+    python benchmarks/load_test_api.py                       # starts a local server in-process
+    python benchmarks/load_test_api.py --url http://127.0.0.1:8765 --clients 16 --seconds 10
+
+Each client thread keeps one HTTP/1.1 connection open and cycles through the
+endpoint mix. In `conditional` mode clients replay the last ETag per path, as
+a polling partner would, so most answers are bodiless 304s.
+"""
+import argparse
+import http.client
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from mn_ews.api import make_server  # noqa: E402
+
+
+def client_loop(host, port, paths, mode, deadline, out):
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    etags, lat, statuses, nbytes = {}, [], {}, 0
+    i = 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        headers = {"Accept-Encoding": "gzip"}
+        if mode == "conditional" and path in etags:
+            headers["If-None-Match"] = etags[path]
+        t0 = time.perf_counter()
+        conn.request("GET", path, headers=headers)
+        resp = conn.getresponse()
+        body = resp.read()
+        lat.append(time.perf_counter() - t0)
+        statuses[resp.status] = statuses.get(resp.status, 0) + 1
+        nbytes += len(body)
+        if resp.getheader("ETag"):
+            etags[path] = resp.getheader("ETag")
+    conn.close()
+    out.append((lat, statuses, nbytes))
+
+
+def run(host, port, paths, mode, clients, seconds):
+    out, deadline = [], time.perf_counter() + seconds
+    threads = [threading.Thread(target=client_loop, args=(host, port, paths, mode, deadline, out))
+               for _ in range(clients)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    lat = sorted(x for r in out for x in r[0])
+    statuses = {}
+    for r in out:
+        for k, v in r[1].items():
+            statuses[k] = statuses.get(k, 0) + v
+    n = len(lat)
+    pct = lambda q: lat[min(n - 1, int(q * n))] * 1000 if n else float("nan")
+    print(f"{mode:<12} {n / elapsed:>9.0f} req/s   p50 {pct(0.50):6.2f} ms   p99 {pct(0.99):6.2f} ms   "
+          f"{sum(r[2] for r in out) / max(n, 1):>8.0f} B/resp   statuses {dict(sorted(statuses.items()))}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--url", help="existing server (default: start one in-process on a free port)")
+    ap.add_argument("--data-dir", help="data directory for the in-process server")
+    ap.add_argument("--clients", type=int, default=8)
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--modes", nargs="+", default=["full", "conditional"], choices=["full", "conditional"])
+    args = ap.parse_args(argv)
+
+    server = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        kw = {"data_dir": args.data_dir} if args.data_dir else {}
+        server = make_server("127.0.0.1", 0, **kw)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = "127.0.0.1", server.server_port
+
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    conn.request("GET", "/counties")
+    counties = json.loads(conn.getresponse().read())["counties"][:10]
+    conn.request("GET", "/overview")
+    scored = [r["County"] for r in json.loads(conn.getresponse().read())["rows"]][:10]
+    conn.close()
+    paths = ["/overview", "/latest", "/health"]
+    paths += [f"/series/{quote(c)}" for c in counties] + [f"/actions/{quote(c)}" for c in scored]
+    print(f"{args.clients} clients x {args.seconds:g}s against {host}:{port}, {len(paths)} paths")
+    try:
+        for mode in args.modes:
+            run(host, port, paths, mode, args.clients, args.seconds)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""End-to-end EWS pipeline benchmark: each stage at several dataset sizes.
+
+    python benchmarks/run_suite.py --sizes 3 87 1000 --weeks 520 --out bench_results.jsonl
+    python benchmarks/run_suite.py --compare bench_results.jsonl --tolerance 1.25
+
+Results are JSON Lines (one record per stage x size) so runs can be diffed or
+compared against a stored baseline; `--compare` exits non-zero on regressions.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from mn_ews import charts  # noqa: E402
+from mn_ews.backtest import run_backtest  # noqa: E402
+from mn_ews.drivers import DriverState  # noqa: E402
+from mn_ews.overrides import DEFAULT_OVERRIDES, CompiledOverrides  # noqa: E402
+from mn_ews.report import executive_summary_pdf, top10_chart_png, trend_chart_png  # noqa: E402
+from mn_ews.rollup import RollupCube  # noqa: E402
+from mn_ews.scoring import make_overview  # noqa: E402
+from mn_ews.series import SeriesIndex  # noqa: E402
+from mn_ews.storage import WEEKLY_SCHEMA, has_arrow, read_csv_typed, read_parquet, write_parquet  # noqa: E402
+from mn_ews.synthetic import generate_weekly  # noqa: E402
+from mn_ews.timing import best_of  # noqa: E402
+
+
+def git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def stages_for(weekly, tmp):
+    """(stage name, zero-arg callable) pairs, each measuring one cold pipeline step."""
+    csv_path, pq_path = Path(tmp) / "weekly.csv", Path(tmp) / "weekly.parquet"
+    weekly.to_csv(csv_path, index=False)
+    overview = make_overview(weekly)
+    index = SeriesIndex(weekly)
+    county = overview["County"].iloc[0]
+    series = index.get(county)
+
+    def render_charts():
+        charts.clear()
+        top10_chart_png(overview)
+        trend_chart_png(series, county)
+
+    # Each call folds one more (shifted) week into the same cube and driver sums, as the app does per upload.
+    cube, drivers = RollupCube(weekly), DriverState.from_weekly(weekly)
+    last_week = weekly[weekly["date"] == weekly["date"].max()]
+    appended = [0]
+
+    def append_week():
+        appended[0] += 1
+        rows = last_week.assign(date=last_week["date"] + np.timedelta64(7 * appended[0], "D"))
+        cube.append(rows)
+        drivers.append(rows)
+        drivers.table()
+
+    out = [("csv_parse", lambda: read_csv_typed(csv_path, WEEKLY_SCHEMA))]
+    if has_arrow():
+        write_parquet(weekly, pq_path)
+        out.append(("parquet_read", lambda: read_parquet(pq_path)))
+    out += [
+        ("score", lambda: make_overview(weekly)),
+        ("series_index", lambda: SeriesIndex(weekly)),
+        ("rollup_cube", lambda: RollupCube(weekly)),
+        ("append_week", append_week),
+        ("backtest_sweep", lambda: run_backtest(weekly).sweep(np.arange(0.20, 0.50, 0.05), np.arange(0.50, 0.80, 0.05))),
+        ("overrides_attach", lambda: CompiledOverrides(DEFAULT_OVERRIDES).attach(overview)),
+        ("chart_render", render_charts),
+        ("pdf_build", lambda: executive_summary_pdf(overview, series, county, None, include_playbook=False,
+                                                    overrides=DEFAULT_OVERRIDES)),
+    ]
+    return out
+
+
+def run(sizes, weeks, repeat):
+    meta = {"git_rev": git_rev(), "python": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    records = []
+    for n in sizes:
+        weekly = generate_weekly(n, weeks, season_period=52, shock_prob=0.01)
+        with tempfile.TemporaryDirectory() as tmp:
+            for stage, fn in stages_for(weekly, tmp):
+                best, median = best_of(fn, repeat)
+                rec = {"stage": stage, "entities": n, "weeks": weeks, "rows": len(weekly),
+                       "best_s": round(best, 6), "median_s": round(median, 6), "repeat": repeat, **meta}
+                records.append(rec)
+                print(f"{stage:<18} {n:>7} x {weeks:<5} best {best * 1000:10.2f} ms   median {median * 1000:10.2f} ms")
+    return records
+
+
+def compare(records, baseline_path, tolerance):
+    with open(baseline_path) as f:
+        base = {}
+        for line in f:
+            r = json.loads(line)
+            base[(r["stage"], r["entities"], r["weeks"])] = r["best_s"]  # latest record per key wins
+    regressions = []
+    for r in records:
+        b = base.get((r["stage"], r["entities"], r["weeks"]))
+        if not b:
+            continue
+        ratio = r["best_s"] / b
+        flag = "REGRESSION" if ratio > tolerance else ""
+        print(f"{r['stage']:<18} {r['entities']:>7}  {b * 1000:10.2f} -> {r['best_s'] * 1000:10.2f} ms  x{ratio:5.2f} {flag}")
+        if flag:
+            regressions.append(r)
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[3, 87, 1000])
+    ap.add_argument("--weeks", type=int, default=520)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--out", help="append results to this JSON Lines file")
+    ap.add_argument("--compare", help="baseline JSON Lines file to compare against")
+    ap.add_argument("--tolerance", type=float, default=1.25, help="allowed slowdown ratio before flagging")
+    args = ap.parse_args(argv)
+
+    records = run(args.sizes, args.weeks, args.repeat)
+    regressions = compare(records, args.compare, args.tolerance) if args.compare else []
+    if args.out:
+        with open(args.out, "a") as f:
+            for r in records:
+                f.write(json.dumps(r) + "\n")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
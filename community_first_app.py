@@ -1,31 +1,28 @@
 
 import streamlit as st
 import pandas as pd
-import numpy as np
-import io, os, json
-import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
-from pathlib import Path
-
-# PDF export
-from reportlab.lib.pagesizes import LETTER
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import inch
-from reportlab.lib.utils import ImageReader
-from reportlab.lib import colors
+import os, json
+
+from mn_ews import charts
+from mn_ews.cache import DiskCache, file_digest, make_key
+from mn_ews.data import bundle_key, load_or_embed_all
+from mn_ews.drivers import STATEWIDE, DriverState, top_drivers
+from mn_ews.history import HistoryStore
+from mn_ews.overrides import DEFAULT_OVERRIDES, load_compiled_overrides
+from mn_ews.paths import BASE_DIR, DATA_DIR
+from mn_ews.report import BORDER, PRIMARY, executive_summary_pdf, trend_chart_png
+from mn_ews.rollup import LEVEL_LABELS, RollupCube, county_level, county_regions, county_regions_file
+from mn_ews.storage import WEEKLY_SCHEMA
+from mn_ews.timing import StageTimer
+from mn_ews.validate import SchemaError, required_columns, validate_csv
 
 st.set_page_config(page_title="Minnesota Food Insecurity EWS", page_icon="📊", layout="wide")
 
-# ----------------- Paths & Branding -----------------
-BASE_DIR = Path(__file__).parent.resolve()
-DATA_DIR = BASE_DIR / "data"
-PRIMARY = "#0B5FFF"
-BORDER  = "#E5E7EB"
-
+# ----------------- Branding -----------------
 def safe_logo(path, caption=None):
     try:
         if path.exists() and path.stat().st_size > 0:
-            st.image(str(path), caption=caption, use_container_width=True)
+            st.image(str(path), caption=caption, use_column_width=True)
         else:
             st.markdown(f"**{caption or 'Logo'}**")
     except Exception:
@@ -42,207 +39,8 @@ def header_brand():
         safe_logo(DATA_DIR / "logo_mde.png", caption="MDE")
     st.markdown(f"<hr style='border:1px solid {BORDER}; margin-top:0;'>", unsafe_allow_html=True)
 
-# --------------- Recommended Actions --------------------
-DEFAULT_OVERRIDES = {
-    "Hennepin County": {
-        "Red": [
-            "Activate city–county joint coordination with DHS/MDE; embed liaison to EOC if active.",
-            "Expand emergency meal sites with weekend kits; coordinate with Metro Transit for last-mile access.",
-            "Same-day SNAP interviews; multilingual SMS (Spanish, Somali, Hmong) via county partners."
-        ],
-        "Amber": [
-            "Pre-stage shelf-stable items at high-throughput pantries; confirm extended hours.",
-            "Target hotspot ZIPs with SNAP outreach through clinics and schools.",
-            "Notify school nutrition directors; prepare weekend kits."
-        ],
-        "Green": [
-            "Baseline SNAP outreach via community partners.",
-            "Monthly drift checks and dashboard sharing with city/county partners."
-        ]
-    },
-    "Ramsey County": {
-        "Red": [
-            "Scale Saint Paul meal sites and weekend/holiday kits in coordination with MDE.",
-            "Stand up SNAP surge staffing; enable walk-in interviews at Service Center.",
-            "Partner with culturally specific CBOs for outreach (e.g., Hmong, Karen, Somali)."
-        ],
-        "Amber": [
-            "Advance TEFAP orders; stage food bank inventory for East Side hotspots.",
-            "Coordinate with SPPS for breakfast expansion and backpack programs.",
-            "Targeted SNAP outreach in transit-poor corridors."
-        ],
-        "Green": [
-            "Maintain baseline pantry logistics and SNAP outreach.",
-            "Monthly QA on forecasts; share brief with county board staff."
-        ]
-    },
-    "St. Louis County": {
-        "Any": [
-            "Coordinate with regional food banks for northland delivery constraints.",
-            "Target SNAP outreach in rural ZIPs; leverage school bus routes for kit distribution.",
-            "Engage tribal partners on culturally appropriate food distribution."
-        ]
-    }
-}
-
-def recommended_actions_for_rag(rag: str):
-    rag = (rag or "").strip().title()
-    if rag == "Red":
-        return [
-            "Pre-position TEFAP and food shelf inventory with regional food banks.",
-            "Stand up emergency meal sites (SSO/SFSP windows where eligible); include weekend/holiday kits.",
-            "Expedite SNAP processing: same-day interviews; reminders for verifications.",
-            "Coordinate with county HHS on emergency housing/utility supports.",
-            "Run weekly incident-style command huddles; monitor pantry throughput daily."
-        ]
-    if rag == "Amber":
-        return [
-            "Alert school nutrition directors; prep weekend meal kits; watch NSLP/SBP vs enrollment.",
-            "Target SNAP outreach in forecast hotspots; promote online apps and phone interviews.",
-            "Advance TEFAP orders; stage shelf-stable items; confirm pantry extended hours.",
-            "Review staffing vs. caseload; prepare surge schedules."
-        ]
-    return [
-        "Maintain baseline SNAP outreach and pantry logistics.",
-        "Monthly forecast QA and drift checks; validate vs observed trends.",
-        "Share dashboards with county partners; sustain data-sharing (SNAP, NSLP, pantry)."
-    ]
-
-def load_overrides(uploaded_json):
-    try:
-        if uploaded_json is not None:
-            return json.load(uploaded_json)
-    except Exception:
-        pass
-    try:
-        p = DATA_DIR / "county_overrides.json"
-        if p.exists():
-            with open(p, "r") as f:
-                return json.load(f)
-    except Exception:
-        pass
-    return DEFAULT_OVERRIDES
-
-def recommended_actions_for_county(county: str, rag: str, overrides: dict):
-    c = (county or "").strip()
-    r = (rag or "").strip().title()
-    if c in overrides and isinstance(overrides[c], dict) and r in overrides[c]:
-        return overrides[c][r], True
-    if c in overrides and isinstance(overrides[c], dict) and "Any" in overrides[c]:
-        return overrides[c]["Any"], True
-    return recommended_actions_for_rag(r), False
-
-# --------------- Embedded Example Data --------------------
-def make_embedded_weekly():
-    start = pd.Timestamp.today().normalize() - pd.Timedelta(weeks=60)
-    weeks = pd.date_range(start, periods=60, freq="W")
-    counties = ["Hennepin County", "Ramsey County", "St. Louis County"]
-    rows = []
-    rng = np.random.default_rng(42)
-    for c in counties:
-        base_snap_apps = rng.integers(300, 600)
-        base_snap_cases = rng.integers(5000, 12000)
-        base_meals = rng.integers(8000, 20000)
-        base_pantry = rng.integers(700, 1400)
-        base_unemp = rng.integers(500, 2000)
-        base_cpi = 250 + rng.uniform(-5, 5)
-        season = (np.sin(np.linspace(0, 4*np.pi, len(weeks))) + 1)/2
-        snap_apps = base_snap_apps + 40*season + rng.normal(0, 15, len(weeks))
-        snap_cases = base_snap_cases + 200*season + rng.normal(0, 60, len(weeks))
-        school_meals = base_meals + 1500*(1-season) + rng.normal(0, 250, len(weeks))
-        pantry_visits = base_pantry + 120*season + rng.normal(0, 35, len(weeks))
-        unemp_claims = base_unemp + 80*season + rng.normal(0, 25, len(weeks))
-        cpi_food = base_cpi + np.linspace(0, 5, len(weeks)) + rng.normal(0, 0.5, len(weeks))
-        for i, d in enumerate(weeks):
-            rows.append({
-                "date": d,
-                "county": c,
-                "SNAP_Applications": int(max(0, round(snap_apps[i]))),
-                "SNAP_Active_Cases": int(max(0, round(snap_cases[i]))),
-                "NSLP_SBP_Participation": int(max(0, round(school_meals[i]))),
-                "Food_Shelf_Visits": int(max(0, round(pantry_visits[i]))),
-                "Unemployment_Claims": int(max(0, round(unemp_claims[i]))),
-                "CPI_Food_At_Home_Index": float(cpi_food[i]),
-                "Eviction_Filings": int(rng.integers(5, 30)),
-                "Utility_Shutoffs": int(rng.integers(10, 45)),
-                "Drought_Severity_Index": float(np.clip(0.4 + 0.2*np.sin(i/8), 0, 1)),
-                "Household_Pulse_Food_Insufficiency_Pct": float(6 + 2*season[i] + rng.normal(0, 0.4))
-            })
-    return pd.DataFrame(rows)
-
-def make_embedded_overview(weekly_df):
-    latest = weekly_df.groupby("county").tail(8).copy()
-    probs = []
-    for c, grp in latest.groupby("county"):
-        x = grp["Food_Shelf_Visits"]
-        mu, sd = x.mean(), x.std(ddof=1) if x.std(ddof=1)>0 else 1.0
-        z = (x.iloc[-1] - mu)/sd
-        p = float(1/(1+np.exp(-z)))
-        probs.append({"County": c, "Prob_Spike_8w": p})
-    df = pd.DataFrame(probs).sort_values("Prob_Spike_8w", ascending=False)
-    def rag(p): return "Red" if p>0.60 else "Amber" if p>=0.30 else "Green"
-    df["RAG_Status"] = df["Prob_Spike_8w"].apply(rag)
-    df["As_Of_Date"] = str(pd.to_datetime(weekly_df["date"]).max().date())
-    df["Lead_Time_Weeks"] = 8
-    return df
-
-def make_embedded_playbook():
-    rows = []
-    for c in ["Hennepin County","Ramsey County","St. Louis County"]:
-        rows.append({
-            "County": c, "RAG_Status": "Amber",
-            "Lead Agency": "DHS (with MDE & county HHS)",
-            "Governance Cadence": "Biweekly situation meeting",
-            "Outreach Focus": "ZIP-targeted SNAP outreach; clinic/school partners"
-        })
-    return pd.DataFrame(rows)
-
-def make_embedded_metrics_ref():
-    return pd.DataFrame([
-        {"Metric":"SNAP_Applications","Definition":"New SNAP apps per week","Refresh Cadence":"Weekly"},
-        {"Metric":"Food_Shelf_Visits","Definition":"Pantry client visits per week","Refresh Cadence":"Weekly"},
-        {"Metric":"Unemployment_Claims","Definition":"UI claims filed","Refresh Cadence":"Weekly"},
-        {"Metric":"CPI_Food_At_Home_Index","Definition":"Grocery price index","Refresh Cadence":"Monthly"},
-        {"Metric":"RAG_Status","Definition":"Risk tier from 8w spike probability","Refresh Cadence":"Weekly"},
-    ])
-
-# --------------- Robust loader with embedded fallback --------------------
-@st.cache_data
-def load_or_embed_all(uploaded_latest, uploaded_overview, uploaded_metrics_ref, uploaded_weekly, uploaded_playbook):
-    def try_csv(upload, relpath, parse_dates=None):
-        if upload is not None:
-            return pd.read_csv(upload, parse_dates=parse_dates) if parse_dates else pd.read_csv(upload)
-        p = DATA_DIR / relpath
-        if p.exists():
-            return pd.read_csv(p, parse_dates=parse_dates) if parse_dates else pd.read_csv(p)
-        if Path(relpath).exists():
-            return pd.read_csv(relpath, parse_dates=parse_dates) if parse_dates else pd.read_csv(relpath)
-        return None
-
-    weekly = try_csv(uploaded_weekly, "synthetic_weekly_inputs_minnesota.csv", parse_dates=["date"])
-    if weekly is None: weekly = make_embedded_weekly()
-
-    overview = try_csv(uploaded_overview, "current_risk_overview_minnesota.csv")
-    if overview is None: overview = make_embedded_overview(weekly)
-
-    latest = try_csv(uploaded_latest, "mn_latest_snapshot_with_RAG.csv", parse_dates=["date"])
-    if latest is None:
-        latest = (weekly[weekly["date"]==weekly["date"].max()]
-                  [["county","date","SNAP_Applications","SNAP_Active_Cases","NSLP_SBP_Participation","Food_Shelf_Visits",
-                    "Unemployment_Claims","CPI_Food_At_Home_Index","Eviction_Filings","Utility_Shutoffs",
-                    "Drought_Severity_Index","Household_Pulse_Food_Insufficiency_Pct"]].copy())
-        ov = overview[["County","Prob_Spike_8w","RAG_Status","Lead_Time_Weeks"]].rename(columns={"County":"county"})
-        latest = latest.merge(ov, on="county", how="left")
-
-    metrics = try_csv(uploaded_metrics_ref, "metrics_reference_minnesota.csv")
-    if metrics is None: metrics = make_embedded_metrics_ref()
-
-    playbook = try_csv(uploaded_playbook, "mn_expanded_RAG_action_playbook.csv")
-    if playbook is None: playbook = make_embedded_playbook()
-
-    return latest, overview, metrics, weekly, playbook
-
 # ----------------- App Body -----------------
+timer = StageTimer()
 header_brand()
 
 # Sidebar uploads
@@ -253,6 +51,7 @@ uploaded_metrics_ref = st.sidebar.file_uploader("Metrics reference (metrics_refe
 st.sidebar.markdown("---")
 uploaded_weekly = st.sidebar.file_uploader("Weekly inputs (synthetic_weekly_inputs_minnesota.csv)", type=["csv"])
 uploaded_playbook = st.sidebar.file_uploader("RAG playbook (mn_expanded_RAG_action_playbook.csv)", type=["csv"])
+uploaded_new_week = st.sidebar.file_uploader("Append new week (rows for the latest week only)", type=["csv"])
 st.sidebar.markdown("---")
 uploaded_overrides = st.sidebar.file_uploader("County overrides (county_overrides.json)", type=["json"])
 
@@ -262,12 +61,115 @@ with st.sidebar.expander("Need a template?"):
     st.download_button("Download overrides template", template_str, file_name="county_overrides_template.json", mime="application/json")
     st.code(template_str[:1000] + ("\n... (truncated)" if len(template_str)>1000 else ""))
 
-latest, overview, metrics_ref, weekly, playbook = load_or_embed_all(
-    uploaded_latest, uploaded_overview, uploaded_metrics_ref, uploaded_weekly, uploaded_playbook
-)
+# Content-addressed disk cache: identical inputs (any user, any restart) skip parsing and scoring
+@st.cache_resource
+def disk_cache():
+    return DiskCache(os.environ.get("MN_EWS_CACHE_DIR", BASE_DIR / ".ews_cache"))
+
+cache = disk_cache()
+with timer.stage("hash_inputs"):
+    data_key = bundle_key({
+        "latest": uploaded_latest, "overview": uploaded_overview, "metrics_ref": uploaded_metrics_ref,
+        "weekly": uploaded_weekly, "playbook": uploaded_playbook,
+    })
+def load_bundle():
+    reports = {}
+    bundle = load_or_embed_all(uploaded_latest, uploaded_overview, uploaded_metrics_ref, uploaded_weekly, uploaded_playbook,
+                               reports=reports)
+    return bundle, reports
+
+with timer.stage("load"):
+    (latest, overview, metrics_ref, weekly, playbook), load_reports = cache.get_or_compute(data_key, load_bundle)
+
+def show_validation(label, report):
+    if isinstance(report, SchemaError):
+        st.sidebar.error(f"{label} rejected: {report}")
+    elif report is not None and not report.ok:
+        st.sidebar.warning(f"{label}: {report.summary()}")
+        with st.sidebar.expander(f"{label} — bad rows"):
+            st.dataframe(report.frame(), use_container_width=True)
+
+show_validation("Weekly inputs", load_reports.get("weekly"))
+
+# Incremental append: the ZIP → county → region → state cube (per-level rows, rolling risk state, overviews and
+# slice maps) and the driver sums are built from the full history once per data version; each appended week is then
+# folded into them in O(entities) instead of re-aggregating the history.
+def upload_token(upload):
+    return None if upload is None else getattr(upload, "file_id", None) or f"{upload.name}:{upload.size}"
+
+# Region assignments come from county_regions.csv, so its digest is part of the cube key: editing it rebuilds.
+regions_file = county_regions_file()
+regions_key = file_digest(regions_file) if regions_file is not None else None
+weekly_token = (data_key, regions_key)
+if st.session_state.get("cube_source") != weekly_token:
+    with timer.stage("rollup"):
+        st.session_state["cube"] = cache.get_or_compute(make_key("rollup", data_key, regions_key),
+                                                        lambda: RollupCube(weekly, regions=county_regions()))
+    with timer.stage("drivers"):
+        st.session_state["driver_state"] = cache.get_or_compute(
+            make_key("drivers", data_key), lambda: DriverState.from_weekly(county_level(weekly), metrics_ref))
+    st.session_state["cube_source"] = weekly_token
+    st.session_state["appended_weeks"] = []
+    st.session_state["appended_ids"] = set()
+    st.session_state["append_report"] = None
+cube = st.session_state["cube"]
+risk_state = cube.risk["county"]
+new_week_token = upload_token(uploaded_new_week)
+if new_week_token is not None and new_week_token not in st.session_state["appended_ids"]:
+    with timer.stage("append"):
+        try:
+            new_rows, st.session_state["append_report"] = validate_csv(uploaded_new_week, WEEKLY_SCHEMA,
+                                                                       required=required_columns(metrics_ref))
+            if cube.append(new_rows):
+                st.session_state["driver_state"].append(county_level(new_rows))
+                st.session_state["appended_weeks"].append(new_week_token)
+        except SchemaError as e:
+            st.session_state["append_report"] = e
+    st.session_state["appended_ids"].add(new_week_token)
+show_validation("New week", st.session_state.get("append_report"))
+if st.session_state["appended_weeks"]:
+    overview = risk_state.overview()
+    latest = risk_state.latest_snapshot()
+    st.sidebar.caption(f"Appended {risk_state.weeks_appended} week(s); risk as of {overview['As_Of_Date'].iloc[0]}")
+
+index_token = (weekly_token, len(st.session_state["appended_weeks"]))
+weekly_index = cube.index["county"]
+
+level = st.sidebar.radio("Geography level", cube.levels, index=cube.levels.index("county"),
+                         format_func=LEVEL_LABELS.get, horizontal=True)
+entity_col = LEVEL_LABELS[level]
+level_overview = overview if level == "county" else cube.overview(level)
+plural = {"zip": "ZIPs", "county": "Counties", "region": "Regions", "state": "State"}[level]
+
+def pick_entity(label, key, options=None):
+    """Entity selector at the current level; ZIPs are picked within a county so lists stay short."""
+    if level == "zip":
+        parent = st.selectbox("County", cube.entities("county"), key=f"{key}_county")
+        return st.selectbox(label, cube.children("county", parent), key=key), parent
+    sel = st.selectbox(label, options if options is not None else cube.entities(level), key=key)
+    return sel, sel
 
 # Load overrides (uploaded or file or defaults)
-overrides = load_overrides(uploaded_overrides)
+with timer.stage("overrides"):
+    overrides = load_compiled_overrides(uploaded_overrides)
+
+# Snapshot history: upsert this week's county overview once per data version, then diff against the prior week.
+# The store is shared by every session, so only the canonical data files are recorded; what-if uploads and
+# appended weeks would otherwise overwrite that week's real history for all users.
+@st.cache_resource
+def history_store():
+    return HistoryStore()
+
+snapshots = history_store()
+changes = None
+canonical = (all(u is None for u in (uploaded_latest, uploaded_overview, uploaded_weekly))
+             and not st.session_state["appended_weeks"])
+if canonical and overview is not None and not overview.empty:
+    with timer.stage("history"):
+        if st.session_state.get("history_source") != index_token:
+            snapshots.record(overview, latest)
+            st.session_state["history_source"] = index_token
+        changes = snapshots.changes_since_last_week(overview["As_Of_Date"].iloc[0])
 
 # KPIs
 kpi_cols = st.columns(4)
@@ -279,13 +181,13 @@ if latest is not None and "date" in latest.columns and not latest.empty:
         as_of = None
 st.session_state["as_of"] = as_of
 kpi_cols[0].metric("As of", as_of or "—")
-if overview is not None and not overview.empty:
-    red_ct = int((overview["RAG_Status"] == "Red").sum())
-    amber_ct = int((overview["RAG_Status"] == "Amber").sum())
-    green_ct = int((overview["RAG_Status"] == "Green").sum())
-    kpi_cols[1].metric("Counties in Red", red_ct)
-    kpi_cols[2].metric("Counties in Amber", amber_ct)
-    kpi_cols[3].metric("Counties in Green", green_ct)
+if level_overview is not None and not level_overview.empty:
+    red_ct = int((level_overview["RAG_Status"] == "Red").sum())
+    amber_ct = int((level_overview["RAG_Status"] == "Amber").sum())
+    green_ct = int((level_overview["RAG_Status"] == "Green").sum())
+    kpi_cols[1].metric(f"{plural} in Red", red_ct)
+    kpi_cols[2].metric(f"{plural} in Amber", amber_ct)
+    kpi_cols[3].metric(f"{plural} in Green", green_ct)
 else:
     for i, label in enumerate(["Red","Amber","Green"], start=1):
         kpi_cols[i].metric(label, "—")
@@ -303,28 +205,41 @@ tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
 ])
 
 with tab1:
-    st.subheader("County Risk Overview — 8-week Horizon")
-    df = overview.copy()
+    st.subheader(f"{entity_col} Risk Overview — 8-week Horizon")
+    df = level_overview.copy()
     if "RAG_Status" in df.columns:
         df["RAG_Badge"] = df["RAG_Status"].apply(lambda t: ":red_circle: Red" if t=="Red" else (":orange_circle: Amber" if t=="Amber" else ":green_circle: Green"))
-    # add summary for export based on overrides
-    def summary_row(row):
-        acts, _ = recommended_actions_for_county(row["County"], row["RAG_Status"], overrides)
-        return " | ".join(acts[:3])
-    df["Recommended_Action_Summary"] = df.apply(summary_row, axis=1)
+    # add summary for export based on overrides (one table lookup per distinct county/RAG pair)
+    with timer.stage("overrides_attach"):
+        df = overrides.attach(df, county_col=entity_col)
     st.dataframe(df, use_container_width=True)
 
     # Chart
-    if "County" in df.columns and "Prob_Spike_8w" in df.columns:
-        fig, ax = plt.subplots()
-        ax.bar(df["County"], df["Prob_Spike_8w"]); ax.set_ylim(0,1)
-        ax.set_ylabel("Probability"); ax.set_title("Predicted Probability of Spike in 8 Weeks — Counties")
-        st.pyplot(fig)
+    if entity_col in df.columns and "Prob_Spike_8w" in df.columns:
+        top = df if len(df) <= 100 else df.head(100)
+        with timer.stage("charts"):
+            st.image(charts.bar_chart(top, entity_col, "Prob_Spike_8w", f"Predicted Probability of Spike in 8 Weeks — {plural}"
+                                      + ("" if top is df else f" (top {len(top)})"), ylabel="Probability", ylim=(0, 1)),
+                     use_column_width=True)
+
+    if level == "county" and not canonical:
+        st.markdown("### Changes Since Last Week")
+        st.caption("Week-over-week history tracks the bundled data files only; uploaded or appended data is not recorded.")
+    elif level == "county" and changes is not None:
+        st.markdown("### Changes Since Last Week")
+        if changes.attrs.get("since") is None:
+            st.caption("Only one week is stored so far; changes appear once an earlier week has been recorded.")
+        elif changes.empty:
+            st.caption(f"No RAG changes since {changes.attrs['since']}.")
+        else:
+            st.caption(f"{changes.attrs['since']} → {changes.attrs['as_of']}")
+            st.dataframe(changes, use_container_width=True)
 
     st.markdown("### Recommended Actions")
-    sel = st.selectbox("Select a county", df["County"].tolist())
-    rag = df.loc[df["County"]==sel, "RAG_Status"].iloc[0]
-    actions, customized = recommended_actions_for_county(sel, rag, overrides)
+    sel, sel_county = pick_entity("Select a county" if level == "county" else f"Select {entity_col}",
+                                  "actions_entity", df[entity_col].tolist() if level != "zip" else None)
+    rag = df.loc[df[entity_col]==sel, "RAG_Status"].iloc[0]
+    actions, customized = overrides.lookup(sel_county, rag)
     st.markdown("**Status:** " + (":red_circle: Red" if rag=="Red" else (":orange_circle: Amber" if rag=="Amber" else ":green_circle: Green")))
     if customized:
         st.success("Using **county-specific overrides**")
@@ -332,23 +247,14 @@ with tab1:
 
 with tab2:
     st.subheader("Weekly Trends — Food Shelf Visits & Lead Indicators")
-    county = st.selectbox("Select County", sorted(weekly["county"].dropna().unique()))
-    w = weekly[weekly["county"]==county].sort_values("date")
+    county, _ = pick_entity("Select County" if level == "county" else f"Select {entity_col}", "trend_entity")
+    w = cube.get(level, county)
     c1, c2 = st.columns(2)
-    with c1:
-        fig1, ax1 = plt.subplots()
-        ax1.plot(w["date"], w["Food_Shelf_Visits"])
-        ax1.set_title(f"Food Shelf Visits — {county}")
-        ax1.set_xlabel("Date"); ax1.set_ylabel("Weekly Visits")
-        st.pyplot(fig1)
-    with c2:
-        fig2, ax2 = plt.subplots()
-        ax2.plot(w["date"], w["SNAP_Applications"], label="SNAP_Applications")
-        ax2.plot(w["date"], w["Unemployment_Claims"], label="Unemployment_Claims")
-        ax2.legend()
-        ax2.set_title(f"Lead Indicators — {county}")
-        ax2.set_xlabel("Date"); ax2.set_ylabel("Weekly Count / Index Units")
-        st.pyplot(fig2)
+    with c1, timer.stage("charts"):
+        st.image(trend_chart_png(w, county), use_column_width=True)
+    with c2, timer.stage("charts"):
+        st.image(charts.line_chart(w, ["SNAP_Applications", "Unemployment_Claims"], f"Lead Indicators — {county}",
+                                   xlabel="Date", ylabel="Weekly Count / Index Units", legend=True), use_column_width=True)
 
 with tab3:
     st.subheader("RAG Action Playbook (MN-aligned)")
@@ -361,85 +267,55 @@ with tab4:
 with tab5:
     st.subheader("One-click PDF Export (Branded)")
     st.caption("Includes RAG counts, top counties, a county trend chart, and **county-specific recommended actions** when defined.")
-    county_for_pdf = st.selectbox("County for trend chart in PDF", sorted(weekly["county"].dropna().unique()))
+    county_for_pdf = st.selectbox("County for trend chart in PDF", weekly_index.keys())
     include_playbook = st.checkbox("Include RAG action playbook summary", value=True)
     if st.button("Generate PDF"):
-        buffer = io.BytesIO()
-        c = canvas.Canvas(buffer, pagesize=LETTER)
-        W, H = LETTER; M = 0.6*inch
-        # header band
-        c.setFillColor(colors.HexColor(PRIMARY)); c.rect(0, H-30, W, 30, fill=True, stroke=False)
-        c.setFillColor(colors.white); c.setFont("Helvetica-Bold", 12)
-        c.drawString(M, H-22, "Minnesota Food Insecurity EWS — Executive Summary")
-        y = H - 50
-        # as-of + RAG counts
-        c.setFillColor(colors.black); c.setFont("Helvetica", 10)
-        c.drawString(M, y, f"As of: {st.session_state.get('as_of','—')}   Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}"); y -= 16
-        red_ct = int((overview['RAG_Status']=='Red').sum()); amber_ct = int((overview['RAG_Status']=='Amber').sum()); green_ct = int((overview['RAG_Status']=='Green').sum())
-        c.setFont("Helvetica-Bold", 11); c.drawString(M, y, "Current RAG Status (Counties)"); y -= 14
-        c.setFont("Helvetica", 10); c.drawString(M, y, f"Red: {red_ct}   Amber: {amber_ct}   Green: {green_ct}"); y -= 18
-        # top-10 chart
-        try:
-            df_tmp = overview.copy().sort_values("Prob_Spike_8w", ascending=False).head(10)
-            img_buf = io.BytesIO(); fig, ax = plt.subplots()
-            ax.bar(df_tmp["County"], df_tmp["Prob_Spike_8w"]); ax.set_ylim(0,1); ax.set_ylabel("Probability"); ax.set_title("Top 10 Counties — 8-week Spike Probability")
-            fig.tight_layout(); fig.savefig(img_buf, format="png", dpi=150); plt.close(fig); img_buf.seek(0)
-            img = ImageReader(img_buf); img_w = W - 2*M; img_h = img_w * 0.45
-            c.drawImage(img, M, y - img_h, width=img_w, height=img_h, mask='auto'); y -= (img_h + 10)
-        except Exception: pass
-        # Recommended actions: top 3 counties (with overrides)
-        c.setFont("Helvetica-Bold", 11); c.drawString(M, y, "Recommended Actions — Top 3 Counties"); y -= 14
-        c.setFont("Helvetica", 9)
-        for _, row in df_tmp.head(3).iterrows():
-            county = row["County"]; rag = row["RAG_Status"]
-            acts, custom = recommended_actions_for_county(county, rag, load_overrides(None))  # use file/default for PDF
-            c.drawString(M, y, f"{county} ({rag})" + (" — customized" if custom else "")); y -= 12
-            for act in acts[:3]:
-                c.drawString(M+14, y, u"• " + act[:100]); y -= 12
-                if y < M + 0.8*inch:
-                    c.showPage(); c.setFont("Helvetica-Bold", 12); c.drawString(M, LETTER[1]-40, "Recommended Actions (cont.)"); y = LETTER[1]-60
-            y -= 4
-        # county trend
-        try:
-            wpdf = weekly[weekly["county"]==county_for_pdf].sort_values("date")
-            img_buf2 = io.BytesIO(); fig2, ax2 = plt.subplots()
-            ax2.plot(wpdf["date"], wpdf["Food_Shelf_Visits"]); ax2.set_title(f"Food Shelf Visits — {county_for_pdf}")
-            ax2.set_xlabel("Date"); ax2.set_ylabel("Weekly Visits")
-            fig2.tight_layout(); fig2.savefig(img_buf2, format="png", dpi=150); plt.close(fig2); img_buf2.seek(0)
-            img2 = ImageReader(img_buf2); img_w2 = W - 2*M; img_h2 = img_w2 * 0.35
-            if y - img_h2 < M:
-                c.showPage(); c.setFont("Helvetica-Bold", 12); c.drawString(M, LETTER[1]-40, "Executive Summary (cont.)"); y = LETTER[1] - 60
-            c.drawImage(img2, M, y - img_h2, width=img_w2, height=img_h2, mask='auto'); y -= (img_h2 + 10)
-        except Exception: pass
-        # optional playbook summary
-        if include_playbook:
-            if y < 1.5*inch:
-                c.showPage(); c.setFont("Helvetica-Bold", 12); c.drawString(M, LETTER[1]-40, "RAG Playbook"); y = LETTER[1]-60
-            c.setFont("Helvetica-Bold", 11); c.drawString(M, y, "RAG Action Playbook — Summary"); y -= 14
-            c.setFont("Helvetica", 9)
-            for _, row in playbook.head(6).iterrows():
-                text = f"- {row.get('County','?')}: {row.get('RAG_Status','?')}; Lead: {row.get('Lead Agency','?')}; Cadence: {row.get('Governance Cadence','?')}"
-                c.drawString(M, y, text[:120]); y -= 12
-                if y < M:
-                    c.showPage(); c.setFont("Helvetica-Bold", 12); c.drawString(M, LETTER[1]-40, "RAG Playbook (cont.)"); y = LETTER[1] - 60
-        c.showPage(); c.save(); buffer.seek(0)
+        with timer.stage("pdf_build"):
+            buffer = executive_summary_pdf(overview, weekly_index.get(county_for_pdf), county_for_pdf, playbook,
+                                           as_of=st.session_state.get("as_of"), include_playbook=include_playbook,
+                                           changes=changes)
         st.download_button("Download PDF", buffer, file_name="MN_EWS_Executive_Summary.pdf", mime="application/pdf")
 
 with tab6:
     st.subheader("Examples — Generated from embedded dataset")
     c1, c2, c3 = st.columns(3)
     df = overview.copy()
-    figA, axA = plt.subplots(); axA.bar(df["County"], df["Prob_Spike_8w"]); axA.set_ylim(0,1); axA.set_title("Spike Probability — Example"); c1.pyplot(figA)
-    county_ex = df["County"].iloc[0]
-    w = weekly[weekly["county"]==county_ex].sort_values("date")
-    figB, axB = plt.subplots(); axB.plot(w["date"], w["Food_Shelf_Visits"]); axB.set_title(f"Food Shelf Visits — {county_ex}"); c2.pyplot(figB)
-    labels = ["SNAP_Applications","Unemployment_Claims","CPI_Food_At_Home_Index"]
-    def pctchg(col):
-        g = weekly.groupby("date")[col].sum() if col!="CPI_Food_At_Home_Index" else weekly.groupby("date")[col].mean()
-        recent, prior = g.tail(4).mean(), g.tail(8).head(4).mean()
-        return 0 if prior==0 else (recent-prior)/prior*100
-    vals = [pctchg(x) for x in labels]
-    figC, axC = plt.subplots(); axC.bar(labels, vals); axC.set_ylabel("% change"); axC.setTitle = "Top Drivers — 4w vs prior 4w"; c3.pyplot(figC)
+    with timer.stage("charts"):
+        c1.image(charts.bar_chart(df, "County", "Prob_Spike_8w", "Spike Probability — Example", ylim=(0, 1)), use_column_width=True)
+        county_ex = df["County"].iloc[0]
+        w = weekly_index.get(county_ex)
+        c2.image(trend_chart_png(w, county_ex), use_column_width=True)
+    # Driver table for every county + statewide and every indicator, from the running sums once per appended week
+    if st.session_state.get("drivers_source") != index_token:
+        with timer.stage("drivers"):
+            st.session_state["drivers"] = st.session_state["driver_state"].table()
+        st.session_state["drivers_source"] = index_token
+    drivers = st.session_state["drivers"]
+    with timer.stage("charts"):
+        c3.image(charts.bar_chart(top_drivers(drivers, STATEWIDE), "Indicator", "Pct_Change",
+                                  "Top Drivers — 4w vs prior 4w", ylabel="% change"), use_column_width=True)
+
+    st.markdown("### Top Drivers")
+    st.caption("Ranked by 4-week change in standard deviations; Lag_Corr is the strongest correlation with Food_Shelf_Visits when the indicator leads by Best_Lag_Weeks.")
+    driver_entity = st.selectbox("Drivers for", [STATEWIDE] + weekly_index.keys())
+    st.dataframe(top_drivers(drivers, driver_entity, n=10), use_container_width=True)
 
 st.markdown(f"<hr style='border:1px solid {BORDER};'>", unsafe_allow_html=True)
 st.caption("© {} Minnesota Food Insecurity EWS — Overrides template download built-in".format(pd.Timestamp.today().year))
+
+# Hidden diagnostics: add ?diagnostics=1 to the URL (or set MN_EWS_DIAGNOSTICS=1)
+if st.query_params.get("diagnostics") == "1" or os.environ.get("MN_EWS_DIAGNOSTICS") == "1":
+    history = st.session_state.setdefault("rerun_timings", [])
+    history.append(round(timer.total() * 1000, 1))
+    del history[:-20]
+    with st.sidebar.expander("🔧 Diagnostics", expanded=True):
+        st.caption(f"This rerun: {history[-1]} ms (last {len(history)}: {', '.join(map(str, history))})")
+        st.dataframe(pd.DataFrame(timer.rows()), use_container_width=True, hide_index=True)
+        disk, chart = cache.stats(), charts.stats()
+        st.dataframe(pd.DataFrame([
+            {"cache": "disk (datasets)", "hits": disk["hits"], "misses": disk["misses"],
+             "hit_rate": f"{disk['hit_rate']:.0%}", "entries": disk["entries"], "MB": round(disk["bytes"] / 1e6, 2)},
+            {"cache": "charts (memory)", "hits": chart["hits"], "misses": chart["renders"],
+             "hit_rate": f"{chart['hit_rate']:.0%}", "entries": chart["entries"], "MB": round(chart["bytes"] / 1e6, 2)},
+        ]), use_container_width=True, hide_index=True)
+        st.caption(f"Open pyplot figures: {chart['pyplot_figures_open']}")
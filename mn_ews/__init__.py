@@ -0,0 +1,38 @@
+"""Minnesota Food Insecurity EWS — loading, scoring, overrides and reporting core.
+
+Submodules are imported on first attribute access (PEP 562) so that
+`import mn_ews` stays cheap for short-lived batch processes; pandas,
+matplotlib and reportlab load only when the code that needs them runs.
+"""
+import importlib
+
+_EXPORTS = {
+    "DEFAULT_THRESHOLDS": "scoring", "DEFAULT_WINDOW": "scoring", "make_overview": "scoring",
+    "rag_from_prob": "scoring", "score_weekly": "scoring",
+    "RollingRiskState": "incremental",
+    "SeriesIndex": "series",
+    "DiskCache": "cache",
+    "load_or_embed_all": "data", "bundle_key": "data",
+    "DEFAULT_OVERRIDES": "overrides", "load_overrides": "overrides",
+    "recommended_actions_for_county": "overrides", "recommended_actions_for_rag": "overrides",
+    "CompiledOverrides": "overrides", "load_compiled_overrides": "overrides",
+    "executive_summary_pdf": "report",
+    "run_backtest": "backtest",
+    "driver_table": "drivers", "top_drivers": "drivers",
+    "HistoryStore": "history",
+    "SnapshotService": "api", "make_server": "api",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,254 @@
+"""Read-only JSON API over the same loaders and scoring as the dashboard.
+
+    python -m mn_ews.api --port 8765 [--data-dir data]
+
+Endpoints: /health, /overview, /latest, /counties, /series/<county>, /actions/<county>.
+Responses are built once per data version and kept in memory with a strong
+ETag and a pre-gzipped body (whose ETag carries a `-gzip` suffix); a change
+to any source file (mtime or size), checked at most once per `check_interval`
+seconds, reloads everything. Clients that poll with If-None-Match (weak
+comparison, lists and `*` accepted) get a bodiless 304.
+"""
+import argparse
+import gzip
+import json
+import re
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .cache import bytes_digest
+from .paths import DATA_DIR
+
+DEFAULT_PORT = 8765
+CHECK_INTERVAL = 1.0
+GZIP_MIN_BYTES = 512
+MAX_CACHED = 4096  # distinct paths kept per data version
+
+
+def _records(df):
+    return json.loads(df.to_json(orient="records", date_format="iso", date_unit="s"))
+
+
+_ETAG_RE = re.compile(r'(?:W/)?"([^"]*)"')
+
+
+def _etag_matches(if_none_match, etags):
+    """Weak comparison of an If-None-Match list (`*`, comma-separated, `W/` tags) against our ETags."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    ours = {tag.strip('"') for tag in etags}
+    return any(tag in ours for tag in _ETAG_RE.findall(if_none_match))
+
+
+class _Response:
+    __slots__ = ("body", "gzipped", "etag", "gzip_etag")
+
+    def __init__(self, payload):
+        self.body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str).encode()
+        self.gzipped = gzip.compress(self.body, 6) if len(self.body) >= GZIP_MIN_BYTES else None
+        digest = bytes_digest(self.body)[:32]
+        self.etag = f'"{digest}"'
+        # A strong ETag names exact bytes, so the gzip encoding gets its own.
+        self.gzip_etag = f'"{digest}-gzip"' if self.gzipped is not None else None
+
+
+class SnapshotService:
+    """Loaded inputs plus a per-version response cache; `respond(path)` is all the handler needs."""
+
+    def __init__(self, data_dir=DATA_DIR, check_interval=CHECK_INTERVAL):
+        self.data_dir = Path(data_dir)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._checked = 0.0
+        self._stamp = None
+        self._state = None
+        self.reloads = 0
+        self.reload()
+
+    @property
+    def as_of(self):
+        return self._state["as_of"]
+
+    # ---- Source tracking ----
+    def _source_paths(self):
+        from .data import SOURCES, search_dirs
+        from .storage import find_table
+        paths = [find_table(rel, search_dirs(self.data_dir)) for _, rel in SOURCES]
+        return [p for p in paths if p is not None] + [self.data_dir / "county_overrides.json"]
+
+    def _current_stamp(self):
+        stamp = []
+        for p in self._source_paths():
+            try:
+                st = p.stat()
+                stamp.append((str(p), st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamp.append((str(p), None, None))
+        return tuple(stamp)
+
+    def reload(self):
+        from .data import load_or_embed_all
+        from .overrides import load_compiled_overrides
+        from .rollup import county_level
+        from .series import SeriesIndex
+
+        stamp = self._current_stamp()
+        latest, overview, _, weekly, _ = load_or_embed_all(data_dir=self.data_dir)
+        index = SeriesIndex(county_level(weekly))
+        as_of = str(overview["As_Of_Date"].iloc[0]) if not overview.empty else None
+        self._state = {
+            "overview": overview, "latest": latest, "index": index, "as_of": as_of,
+            "overrides": load_compiled_overrides(None, self.data_dir),
+            "rag": dict(zip(overview["County"].astype(str), overview["RAG_Status"])),
+            "version": bytes_digest(repr(stamp).encode())[:16],
+            "loaded_at": datetime.now().isoformat(timespec="seconds"),
+            "responses": {},
+        }
+        self._stamp = stamp
+        self.reloads += 1
+
+    def refresh(self):
+        """Reload when a source file changed; stats files at most once per `check_interval`."""
+        now = time.monotonic()
+        if now - self._checked < self.check_interval:
+            return
+        with self._lock:
+            if now - self._checked < self.check_interval:
+                return
+            self._checked = now
+            if self._current_stamp() != self._stamp:
+                try:
+                    self.reload()
+                except Exception:
+                    pass  # keep serving the last good version (e.g. a file mid-write); retried next interval
+
+    # ---- Payloads ----
+    def _payload(self, state, route, arg, query):
+        if route == "overview":
+            return {"as_of": state["as_of"], "rows": _records(state["overview"])}
+        if route == "latest":
+            return {"as_of": state["as_of"], "rows": _records(state["latest"]) if state["latest"] is not None else []}
+        if route == "counties":
+            return {"counties": [str(c) for c in state["index"].keys()]}
+        if route == "series":
+            if arg not in state["index"]:
+                return None
+            columns = query.get("columns", [None])[0]
+            columns = ["date", *[c for c in columns.split(",") if c != "date"]] if columns else None
+            rows = state["index"].get(arg)
+            if columns:
+                rows = rows[[c for c in columns if c in rows.columns]]
+            else:
+                rows = rows.drop(columns=["county"], errors="ignore")
+            return {"county": arg, "rows": _records(rows)}
+        if route == "actions":
+            rag = state["rag"].get(arg)
+            if rag is None:
+                return None
+            actions, customized = state["overrides"].lookup(arg, rag)
+            return {"county": arg, "as_of": state["as_of"], "rag_status": rag,
+                    "actions": list(actions), "customized": bool(customized)}
+        return None
+
+    def respond(self, raw_path):
+        """(status, _Response) for a GET path; 404s are cached like any other response."""
+        self.refresh()
+        state = self._state
+        if urlsplit(raw_path).path.rstrip("/") == "/health":
+            return 200, _Response({"status": "ok", "as_of": state["as_of"], "version": state["version"],
+                                   "loaded_at": state["loaded_at"], "reloads": self.reloads})
+        cache = state["responses"]
+        hit = cache.get(raw_path)
+        if hit is None:
+            parts = urlsplit(raw_path)
+            route, _, arg = parts.path.strip("/").partition("/")
+            try:
+                payload = self._payload(state, route, unquote(arg), parse_qs(parts.query))
+            except Exception as e:
+                return 500, _Response({"error": f"{type(e).__name__}: {e}"})
+            hit = (200, _Response(payload)) if payload is not None else (404, _Response({"error": "not found"}))
+            if len(cache) < MAX_CACHED:
+                cache[raw_path] = hit
+        return hit
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "mn-ews-api"
+    disable_nagle_algorithm = True  # headers and body are separate writes; avoid the delayed-ACK stall on keep-alive
+    service = None
+    quiet = True
+
+    def _send(self, head_only=False):
+        status, resp = self.service.respond(self.path)
+        use_gzip = resp.gzipped is not None and "gzip" in self.headers.get("Accept-Encoding", "")
+        etag = resp.gzip_etag if use_gzip else resp.etag
+        # Either encoding's tag validates: both name the same JSON.
+        if status == 200 and _etag_matches(self.headers.get("If-None-Match"), (resp.etag, resp.gzip_etag or resp.etag)):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Vary", "Accept-Encoding")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = resp.gzipped if use_gzip else resp.body
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        self._send()
+
+    def do_HEAD(self):
+        self._send(head_only=True)
+
+    def log_message(self, fmt, *args):
+        if not self.quiet:
+            super().log_message(fmt, *args)
+
+
+def make_server(host="127.0.0.1", port=DEFAULT_PORT, data_dir=DATA_DIR, check_interval=CHECK_INTERVAL, quiet=True):
+    """A ThreadingHTTPServer bound to (host, port); port 0 picks a free one (see `server.server_port`)."""
+    service = SnapshotService(data_dir, check_interval)
+    handler = type("Handler", (_Handler,), {"service": service, "quiet": quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Serve EWS risk snapshots as JSON with ETag/gzip caching.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ap.add_argument("--data-dir", default=str(DATA_DIR))
+    ap.add_argument("--check-interval", type=float, default=CHECK_INTERVAL,
+                    help="seconds between source-file change checks")
+    ap.add_argument("--verbose", action="store_true", help="log every request")
+    args = ap.parse_args(argv)
+    server = make_server(args.host, args.port, args.data_dir, args.check_interval, quiet=not args.verbose)
+    print(f"Serving on http://{args.host}:{server.server_port} (as of {server.service.as_of})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Rolling-origin backtest of `Prob_Spike_8w` against observed Food_Shelf_Visits spikes.
+
+The scoring is replayed at every historical week of every county in one pass:
+trailing-window sums come from per-county cumulative sums over the sorted
+value array, so no week is re-scored from scratch. Threshold sweeps then work
+on the sorted probabilities with cumulative counts.
+
+    python -m mn_ews.backtest --ambers 0.2 0.3 0.4 --reds 0.5 0.6 0.7
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from .scoring import (DEFAULT_HORIZON, DEFAULT_THRESHOLDS, DEFAULT_WINDOW, VALUE_COL, _sorted_groups,
+                      spike_probability)
+
+DEFAULT_SPIKE_SD = 1.5
+
+
+def _trailing_stats(xc, i, n):
+    """Mean and sample std of xc[i-n+1 .. i] (n >= 1), via prefix sums."""
+    s1 = np.concatenate([[0.0], np.cumsum(xc)])
+    s2 = np.concatenate([[0.0], np.cumsum(xc * xc)])
+    lo = i - n + 1
+    total, total_sq = s1[i + 1] - s1[lo], s2[i + 1] - s2[lo]
+    mu = total / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var = np.where(n > 1, (total_sq - n * mu * mu) / (n - 1), np.nan)
+    return mu, np.sqrt(np.maximum(var, 0.0))
+
+
+def rolling_scores(weekly_df, window=DEFAULT_WINDOW, key="county", value_col=VALUE_COL):
+    """Every (entity, week) scored with only the data available that week.
+
+    The last row per entity equals `score_weekly` for the full history.
+    """
+    df, codes, _, counts, starts, ends = _sorted_groups(weekly_df, key, value_col)
+    x = df[value_col].to_numpy(dtype=float)
+    # Center each series on its own mean so the prefix sums stay well-conditioned.
+    gmean = np.bincount(codes, weights=x, minlength=len(counts)) / np.maximum(counts, 1)
+    xc = x - gmean[codes]
+    i = np.arange(len(x))
+    pos = i - starts[codes]
+    n = np.minimum(pos + 1, window)
+    mu_c, sd = _trailing_stats(xc, i, n)
+    z, p = spike_probability(xc, mu_c, sd)
+    out = df.reset_index(drop=True)
+    out["Rolling_Mean"] = mu_c + gmean[codes]
+    out["Rolling_Std"] = sd
+    out["Z_Score"] = z
+    out["Prob_Spike_8w"] = p
+    return out, codes, pos, ends
+
+
+class BacktestResult:
+    """Per-forecast arrays plus threshold evaluation helpers."""
+
+    def __init__(self, frame, horizon, spike_sd):
+        self.frame, self.horizon, self.spike_sd = frame, horizon, spike_sd
+        ev = frame[frame["Evaluable"]]
+        self.p = ev["Prob_Spike_8w"].to_numpy()
+        self.y = ev["Spike_Within_Horizon"].to_numpy()
+        self.lead = ev["Weeks_To_Next_Spike"].to_numpy(dtype=float)
+        self.brier = float(np.mean((self.p - self.y) ** 2)) if len(self.p) else float("nan")
+        order = np.argsort(self.p, kind="mergesort")
+        self._p_sorted = self.p[order]
+        # Suffix sums over the ascending order: alarms at threshold t are the tail p >= t (or > t).
+        self._hits_tail = np.concatenate([np.cumsum(self.y[order][::-1])[::-1], [0]])
+        lead_hit = np.where(self.y, self.lead, 0.0)[order]
+        self._lead_tail = np.concatenate([np.cumsum(lead_hit[::-1])[::-1], [0.0]])
+
+    def _at(self, t, strict):
+        k = np.searchsorted(self._p_sorted, t, side="right" if strict else "left")
+        alarms = len(self._p_sorted) - k
+        hits = self._hits_tail[k]
+        return alarms, hits, self._lead_tail[k]
+
+    def _row(self, level, amber, red, alarms, hits, lead_sum):
+        events = int(self.y.sum())
+        return {
+            "amber": amber, "red": red, "level": level,
+            "forecasts": len(self.p), "events": events, "alarms": int(alarms), "hits": int(hits),
+            "false_alarms": int(alarms - hits), "misses": int(events - hits),
+            "hit_rate": hits / events if events else np.nan,
+            "false_alarm_ratio": (alarms - hits) / alarms if alarms else np.nan,
+            "mean_lead_weeks": lead_sum / hits if hits else np.nan,
+            "brier": self.brier,
+        }
+
+    def _rows(self, amber, red):
+        return [self._row("Red", amber, red, *self._at(red, strict=True)),
+                self._row("Amber+", amber, red, *self._at(amber, strict=False))]
+
+    def evaluate(self, thresholds=DEFAULT_THRESHOLDS):
+        """Hit rate, false alarms and realized lead time for Red and Amber-or-worse alarms."""
+        return pd.DataFrame(self._rows(*thresholds))
+
+    def sweep(self, ambers, reds):
+        """`evaluate` over every amber < red combination."""
+        return pd.DataFrame([row for a in ambers for r in reds if a < r for row in self._rows(float(a), float(r))])
+
+
+def run_backtest(weekly_df, window=DEFAULT_WINDOW, horizon=DEFAULT_HORIZON, spike_sd=DEFAULT_SPIKE_SD,
+                 key="county", value_col=VALUE_COL):
+    """Replay scoring at every week and label each forecast against the next `horizon` weeks.
+
+    A week is a spike when its value exceeds the previous week's trailing mean
+    by more than `spike_sd` trailing standard deviations. Forecasts are
+    evaluable once a full window of history exists and the full horizon has
+    been observed.
+    """
+    frame, codes, pos, ends = rolling_scores(weekly_df, window, key, value_col)
+    N = len(frame)
+    x = frame[value_col].to_numpy(dtype=float)
+    mu, sd = frame["Rolling_Mean"].to_numpy(), frame["Rolling_Std"].to_numpy()
+    prev_mu, prev_sd = np.roll(mu, 1), np.roll(sd, 1)
+    spike = (pos >= window) & (x > prev_mu + spike_sd * np.nan_to_num(prev_sd, nan=np.inf))
+    # Index of the first spike strictly after i within the same series.
+    idx = np.where(spike, np.arange(N), N)
+    next_incl = np.concatenate([np.minimum.accumulate(idx[::-1])[::-1], [N]])
+    nxt = next_incl[np.arange(N) + 1]
+    group_end = ends[codes]
+    lead = np.where(nxt < group_end, nxt - np.arange(N), np.nan)
+    frame["Is_Spike"] = spike
+    frame["Weeks_To_Next_Spike"] = lead
+    frame["Spike_Within_Horizon"] = lead <= horizon
+    frame["Evaluable"] = (pos >= window - 1) & (np.arange(N) + horizon < group_end)
+    return BacktestResult(frame, horizon, spike_sd)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Backtest spike probabilities and sweep RAG thresholds.")
+    ap.add_argument("--ambers", type=float, nargs="+", default=[0.20, 0.25, 0.30, 0.35, 0.40])
+    ap.add_argument("--reds", type=float, nargs="+", default=[0.50, 0.55, 0.60, 0.65, 0.70])
+    ap.add_argument("--window", type=int, default=DEFAULT_WINDOW)
+    ap.add_argument("--horizon", type=int, default=DEFAULT_HORIZON)
+    ap.add_argument("--spike-sd", type=float, default=DEFAULT_SPIKE_SD)
+    ap.add_argument("--synthetic", metavar="ENTITIESxWEEKS", help="backtest generated data, e.g. 87x520")
+    ap.add_argument("--out", help="write the sweep table to this CSV")
+    args = ap.parse_args(argv)
+
+    if args.synthetic:
+        from .synthetic import generate_weekly
+        n, w = (int(v) for v in args.synthetic.lower().split("x"))
+        weekly = generate_weekly(n, w, season_period=52, shock_prob=0.01)
+    else:
+        from .data import load_or_embed_all
+        from .rollup import county_level
+        weekly = county_level(load_or_embed_all()[3])
+    result = run_backtest(weekly, args.window, args.horizon, args.spike_sd)
+    table = result.sweep(args.ambers, args.reds)
+    print(f"{len(result.p):,} evaluable forecasts, {int(result.y.sum()):,} with a spike within "
+          f"{args.horizon} weeks; Brier {result.brier:.4f}")
+    with pd.option_context("display.width", 200, "display.max_rows", 200):
+        print(table.round(3).to_string(index=False))
+    if args.out:
+        table.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
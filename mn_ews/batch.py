@@ -0,0 +1,106 @@
+"""Headless batch export: one branded executive summary per county, across a process pool.
+
+    python -m mn_ews.batch --out reports/ [--counties "Hennepin County" "Ramsey County"] [--workers 8]
+
+Shared charts (the statewide top-10 bar chart) are rendered once in the parent
+and handed to every worker. A `manifest.json` with per-file timings is written
+next to the PDFs.
+"""
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+from .paths import DATA_DIR
+
+_ctx = {}
+
+
+def county_filename(county):
+    return re.sub(r"[^A-Za-z0-9]+", "_", str(county)).strip("_") + ".pdf"
+
+
+def _init_worker(ctx):
+    _ctx.update(ctx)
+
+
+def _render_one(county, county_series):
+    from .report import executive_summary_pdf, trend_chart_png
+    t0 = time.perf_counter()
+    pdf = executive_summary_pdf(
+        _ctx["overview"], county_series, county, _ctx["playbook"], as_of=_ctx["as_of"],
+        include_playbook=_ctx["include_playbook"], overrides=_ctx["overrides"],
+        top10_png=_ctx["top10_png"], trend_png=trend_chart_png(county_series, county), county_focus=True)
+    path = Path(_ctx["out_dir"]) / county_filename(county)
+    path.write_bytes(pdf)
+    return {"county": str(county), "file": path.name, "bytes": len(pdf), "seconds": round(time.perf_counter() - t0, 4)}
+
+
+def export_all(out_dir, counties=None, workers=None, data_dir=DATA_DIR, overrides_path=None, include_playbook=True):
+    """Write one PDF per county into `out_dir` and return the manifest dict."""
+    from .data import load_or_embed_all
+    from .overrides import load_compiled_overrides
+    from .report import top10_chart_png
+    from .rollup import county_level
+    from .series import SeriesIndex
+
+    t0 = time.perf_counter()
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    latest, overview, _, weekly, playbook = load_or_embed_all(data_dir=data_dir)
+    index = SeriesIndex(county_level(weekly))
+    wanted = list(counties) if counties else index.keys()
+    missing = [c for c in wanted if c not in index]
+    if missing:
+        raise SystemExit(f"unknown counties: {', '.join(map(str, missing))}")
+    if overrides_path:
+        with open(overrides_path, "rb") as f:
+            overrides = load_compiled_overrides(f, data_dir)
+    else:
+        overrides = load_compiled_overrides(None, data_dir)
+    as_of = str(latest["date"].max().date()) if latest is not None and not latest.empty else None
+    ctx = {"overview": overview, "playbook": playbook, "as_of": as_of, "overrides": overrides,
+           "include_playbook": include_playbook, "top10_png": top10_chart_png(overview), "out_dir": str(out_dir)}
+
+    files = []
+    workers = workers or min(len(wanted), os.cpu_count() or 1)
+    if workers <= 1:
+        _init_worker(ctx)
+        files = [_render_one(c, index.get(c)) for c in wanted]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(ctx,)) as pool:
+            futures = [pool.submit(_render_one, c, index.get(c)) for c in wanted]
+            files = [f.result() for f in as_completed(futures)]
+    order = {str(c): i for i, c in enumerate(wanted)}
+    files.sort(key=lambda r: order[r["county"]])
+
+    manifest = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "as_of": as_of, "workers": workers, "count": len(files),
+        "total_seconds": round(time.perf_counter() - t0, 4), "files": files,
+    }
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate the branded executive summary for every county.")
+    ap.add_argument("--out", default="reports", help="output directory (default: reports/)")
+    ap.add_argument("--counties", nargs="+", help="subset of counties (default: all)")
+    ap.add_argument("--workers", type=int, help="process pool size (default: CPU count)")
+    ap.add_argument("--data-dir", default=str(DATA_DIR))
+    ap.add_argument("--overrides", help="county_overrides.json to use instead of the data dir copy")
+    ap.add_argument("--no-playbook", action="store_true", help="omit the RAG playbook summary")
+    args = ap.parse_args(argv)
+    manifest = export_all(args.out, args.counties, args.workers, args.data_dir, args.overrides,
+                          include_playbook=not args.no_playbook)
+    print(f"Wrote {manifest['count']} PDFs to {args.out} in {manifest['total_seconds']:.2f}s "
+          f"({manifest['workers']} workers)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Content-addressed, size-bounded disk cache for loaded and derived datasets.
+
+Keys are SHA-256 digests of the input bytes plus `CODE_VERSION` and any
+parameters (window, thresholds), so identical uploads from different users
+and cold restarts land on the same entry. Eviction is least-recently-used by
+file mtime, which `get` refreshes on every hit.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+CODE_VERSION = "6"  # bump when loading/scoring semantics change
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_file_digests = {}
+_upload_digests = {}  # file_id -> digest; a file_id names one immutable upload
+MAX_UPLOAD_DIGESTS = 256
+
+
+def bytes_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 of a file, re-hashed only when its mtime or size changes."""
+    path = Path(path)
+    st = path.stat()
+    memo_key = (str(path.resolve()), st.st_mtime_ns, st.st_size)
+    if memo_key not in _file_digests:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                h.update(chunk)
+        _file_digests[memo_key] = h.hexdigest()
+    return _file_digests[memo_key]
+
+
+def upload_digest(upload):
+    """SHA-256 of an upload's bytes, hashed once per Streamlit `file_id` rather than on every rerun."""
+    if upload is None:
+        return None
+    file_id = getattr(upload, "file_id", None)
+    if file_id is None:
+        return bytes_digest(upload.getvalue())
+    if file_id not in _upload_digests:
+        if len(_upload_digests) >= MAX_UPLOAD_DIGESTS:
+            _upload_digests.pop(next(iter(_upload_digests)))  # oldest first
+        _upload_digests[file_id] = bytes_digest(upload.getvalue())
+    return _upload_digests[file_id]
+
+
+def make_key(*parts):
+    h = hashlib.sha256(f"v{CODE_VERSION}".encode())
+    for p in parts:
+        h.update(b"\x1f" + repr(p).encode())
+    return h.hexdigest()
+
+
+class DiskCache:
+    def __init__(self, root, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evictions = 0
+
+    def _path(self, key):
+        return self.root / key[:2] / f"{key}.pkl"
+
+    def get(self, key, default=None):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return default
+        except Exception:
+            # Truncated or incompatible entry: drop it and treat as a miss.
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return default
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)  # atomic: concurrent readers never see a partial file
+        self.evict()
+        return value
+
+    def get_or_compute(self, key, fn):
+        sentinel = object()
+        value = self.get(key, sentinel)
+        return self.put(key, fn()) if value is sentinel else value
+
+    def entries(self):
+        out = []
+        for p in self.root.glob("*/*.pkl"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            out.append((st.st_mtime, st.st_size, p))
+        return out
+
+    def size_bytes(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in entries:
+            if total <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        for _, _, p in self.entries():
+            p.unlink(missing_ok=True)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self.entries()), "bytes": self.size_bytes()}
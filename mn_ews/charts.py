@@ -0,0 +1,99 @@
+"""Memoized chart rendering shared by the dashboard tabs and the PDF export.
+
+Charts are drawn on standalone `matplotlib.figure.Figure` objects (never the
+pyplot registry), saved to PNG/SVG bytes and cleared immediately, so nothing
+outlives a render. Bytes are memoized per (chart kind, title, spec, data
+fingerprint, format) in a bounded LRU.
+"""
+import hashlib
+import io
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+DPI = 150
+MAX_ENTRIES = 256
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+_stats = {"renders": 0, "hits": 0, "evictions": 0}
+
+
+def fingerprint(data):
+    """Stable digest of a frame's values and column names."""
+    if isinstance(data, pd.Series):
+        data = data.to_frame()
+    values = pd.util.hash_pandas_object(data, index=False).to_numpy()
+    return hashlib.sha256(values.tobytes() + repr(list(data.columns)).encode()).hexdigest()[:20]
+
+
+def _draw(plot, fmt, dpi):
+    from matplotlib.figure import Figure
+    fig = Figure()
+    try:
+        plot(fig.subplots())
+        fig.tight_layout()
+        buf = io.BytesIO()
+        fig.savefig(buf, format=fmt, dpi=dpi)
+        return buf.getvalue()
+    finally:
+        fig.clear()
+
+
+def _memo(key, plot, fmt, dpi):
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return _cache[key]
+    out = _draw(plot, fmt, dpi)
+    with _lock:
+        _stats["renders"] += 1
+        _cache[key] = out
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+            _stats["evictions"] += 1
+    return out
+
+
+def bar_chart(data, x, y, title, ylabel=None, ylim=None, fmt="png", dpi=DPI):
+    frame = data[[x, y]]
+    def plot(ax):
+        ax.bar(frame[x].astype(str), frame[y])
+        if ylim is not None: ax.set_ylim(*ylim)
+        if ylabel: ax.set_ylabel(ylabel)
+        ax.set_title(title)
+    key = ("bar", title, x, y, ylabel, ylim, fingerprint(frame), fmt, dpi)
+    return _memo(key, plot, fmt, dpi)
+
+
+def line_chart(data, ys, title, xlabel=None, ylabel=None, legend=False, x="date", fmt="png", dpi=DPI):
+    ys = [ys] if isinstance(ys, str) else list(ys)
+    frame = data[[x, *ys]]
+    def plot(ax):
+        for col in ys:
+            ax.plot(frame[x], frame[col], label=col)
+        if legend: ax.legend()
+        ax.set_title(title)
+        if xlabel: ax.set_xlabel(xlabel)
+        if ylabel: ax.set_ylabel(ylabel)
+    key = ("line", title, x, tuple(ys), xlabel, ylabel, legend, fingerprint(frame), fmt, dpi)
+    return _memo(key, plot, fmt, dpi)
+
+
+def stats():
+    """Render/hit counters plus open pyplot figures (should stay at zero)."""
+    with _lock:
+        lookups = _stats["renders"] + _stats["hits"]
+        out = dict(_stats, entries=len(_cache), bytes=sum(len(v) for v in _cache.values()),
+                   hit_rate=_stats["hits"] / lookups if lookups else 0.0)
+    plt = sys.modules.get("matplotlib.pyplot")
+    out["pyplot_figures_open"] = len(plt.get_fignums()) if plt else 0
+    return out
+
+
+def clear():
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,105 @@
+"""Input loading with embedded example fallbacks."""
+from pathlib import Path
+
+import pandas as pd
+
+from .cache import file_digest, make_key, upload_digest
+from .paths import DATA_DIR
+from .rollup import county_level
+from .scoring import DEFAULT_THRESHOLDS, DEFAULT_WINDOW, make_overview
+from .storage import WEEKLY_SCHEMA, apply_schema, find_table, read_csv_typed, read_table, schema_for
+from .synthetic import generate_weekly
+from .validate import SchemaError, required_columns, validate_csv
+
+SOURCES = [
+    ("latest", "mn_latest_snapshot_with_RAG.csv"),
+    ("overview", "current_risk_overview_minnesota.csv"),
+    ("metrics_ref", "metrics_reference_minnesota.csv"),
+    ("weekly", "synthetic_weekly_inputs_minnesota.csv"),
+    ("playbook", "mn_expanded_RAG_action_playbook.csv"),
+]
+
+def search_dirs(data_dir=DATA_DIR):
+    return [Path(data_dir), Path(".")]
+
+def make_embedded_weekly():
+    return generate_weekly(n_entities=3, n_weeks=60, seed=42)
+
+def make_embedded_overview(weekly_df, window=DEFAULT_WINDOW, thresholds=DEFAULT_THRESHOLDS):
+    return make_overview(weekly_df, window=window, thresholds=thresholds)
+
+def make_embedded_playbook():
+    rows = []
+    for c in ["Hennepin County","Ramsey County","St. Louis County"]:
+        rows.append({
+            "County": c, "RAG_Status": "Amber",
+            "Lead Agency": "DHS (with MDE & county HHS)",
+            "Governance Cadence": "Biweekly situation meeting",
+            "Outreach Focus": "ZIP-targeted SNAP outreach; clinic/school partners"
+        })
+    return pd.DataFrame(rows)
+
+def make_embedded_metrics_ref():
+    return pd.DataFrame([
+        {"Metric":"SNAP_Applications","Definition":"New SNAP apps per week","Refresh Cadence":"Weekly"},
+        {"Metric":"Food_Shelf_Visits","Definition":"Pantry client visits per week","Refresh Cadence":"Weekly"},
+        {"Metric":"Unemployment_Claims","Definition":"UI claims filed","Refresh Cadence":"Weekly"},
+        {"Metric":"CPI_Food_At_Home_Index","Definition":"Grocery price index","Refresh Cadence":"Monthly"},
+        {"Metric":"RAG_Status","Definition":"Risk tier from 8w spike probability","Refresh Cadence":"Weekly"},
+    ])
+
+# --------------- Robust loader with embedded fallback --------------------
+def load_or_embed_all(uploaded_latest=None, uploaded_overview=None, uploaded_metrics_ref=None,
+                      uploaded_weekly=None, uploaded_playbook=None, data_dir=DATA_DIR, reports=None):
+    """`reports`, when a dict, receives the weekly upload's ValidationReport (or SchemaError) under "weekly"."""
+    def try_csv(upload, relpath):
+        # Typed reads; a converted <name>.parquet next to the CSV wins over the CSV itself.
+        if upload is not None:
+            return read_csv_typed(upload, schema_for(relpath))
+        return read_table(relpath, search_dirs(data_dir))
+
+    metrics = try_csv(uploaded_metrics_ref, "metrics_reference_minnesota.csv")
+    if metrics is None: metrics = make_embedded_metrics_ref()
+
+    # Uploaded weekly history is streamed through the validator; a fatal schema error falls back to bundled data.
+    weekly = None
+    if uploaded_weekly is not None:
+        try:
+            weekly, report = validate_csv(uploaded_weekly, WEEKLY_SCHEMA, required=required_columns(metrics))
+        except SchemaError as e:
+            report = e
+        if reports is not None: reports["weekly"] = report
+    if weekly is None: weekly = try_csv(None, "synthetic_weekly_inputs_minnesota.csv")
+    if weekly is None: weekly = apply_schema(make_embedded_weekly(), WEEKLY_SCHEMA)
+
+    # ZIP-level uploads are rolled up to county rows for the county-keyed fallbacks below.
+    county_weekly = county_level(weekly)
+
+    overview = try_csv(uploaded_overview, "current_risk_overview_minnesota.csv")
+    if overview is None: overview = make_embedded_overview(county_weekly)
+
+    latest = try_csv(uploaded_latest, "mn_latest_snapshot_with_RAG.csv")
+    if latest is None:
+        latest = (county_weekly[county_weekly["date"]==county_weekly["date"].max()]
+                  [["county","date","SNAP_Applications","SNAP_Active_Cases","NSLP_SBP_Participation","Food_Shelf_Visits",
+                    "Unemployment_Claims","CPI_Food_At_Home_Index","Eviction_Filings","Utility_Shutoffs",
+                    "Drought_Severity_Index","Household_Pulse_Food_Insufficiency_Pct"]].copy())
+        ov = overview[["County","Prob_Spike_8w","RAG_Status","Lead_Time_Weeks"]].rename(columns={"County":"county"})
+        latest = latest.merge(ov, on="county", how="left")
+
+    playbook = try_csv(uploaded_playbook, "mn_expanded_RAG_action_playbook.csv")
+    if playbook is None: playbook = make_embedded_playbook()
+
+    return latest, overview, metrics, weekly, playbook
+
+def source_digest(upload, relpath, data_dir=DATA_DIR):
+    if upload is not None:
+        return upload_digest(upload)
+    path = find_table(relpath, search_dirs(data_dir))
+    return file_digest(path) if path is not None else f"embedded:{pd.Timestamp.today().date()}"
+
+def bundle_key(uploads=None, data_dir=DATA_DIR, window=DEFAULT_WINDOW, thresholds=DEFAULT_THRESHOLDS):
+    """Content key of the five inputs (in `load_or_embed_all` order) plus scoring parameters."""
+    uploads = uploads or {}
+    return make_key("bundle", window, tuple(thresholds),
+                    *[source_digest(uploads.get(name), relpath, data_dir) for name, relpath in SOURCES])
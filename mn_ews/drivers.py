@@ -0,0 +1,230 @@
+"""Driver attribution: how every indicator moved, and how it tracks Food_Shelf_Visits.
+
+One sort and one set of grouped reductions covers every county, a statewide
+roll-up and every indicator column at once; `DriverState` keeps those sums so
+an appended week is folded in without revisiting the history, and
+`top_drivers` then just filters the table.
+"""
+import numpy as np
+import pandas as pd
+
+from .scoring import VALUE_COL
+from .storage import INDEX_COLS
+
+STATEWIDE = "Minnesota (Statewide)"
+DEFAULT_RECENT = 4
+DEFAULT_MAX_LAG = 4
+
+
+def indicator_columns(weekly_df, metrics_ref=None, value_col=VALUE_COL):
+    """Numeric weekly columns named in the metrics reference (all numeric columns without one)."""
+    if metrics_ref is not None and "Metric" in metrics_ref.columns:
+        names = metrics_ref["Metric"].dropna().astype(str).tolist()
+    else:
+        names = list(weekly_df.columns)
+    out = []
+    for c in names:
+        if (c in weekly_df.columns and c not in out and c not in (value_col, "date", "county")
+                and pd.api.types.is_numeric_dtype(weekly_df[c])):
+            out.append(c)
+    return out
+
+
+def statewide(weekly_df, columns, key="county"):
+    """Weekly statewide series: counts are summed across counties, index columns averaged."""
+    agg = {c: "mean" if c in INDEX_COLS else "sum" for c in columns}
+    out = weekly_df.groupby("date", sort=True)[list(agg)].agg(agg).reset_index()
+    out[key] = STATEWIDE
+    return out
+
+
+def _gsum(m, starts):
+    return np.add.reduceat(m, starts, axis=0)
+
+
+_TABLE_COLS = ["Indicator", "Recent_Mean", "Prior_Mean", "Pct_Change", "Z_Score", "Lag_Corr", "Best_Lag_Weeks"]
+
+
+class DriverState:
+    """Running sums behind `driver_table`, so an appended week updates it in O(entities x indicators).
+
+    Per (entity, indicator) it keeps the valid count, sum and sum of squares
+    (shifted by the entity's mean at build time for conditioning), the same
+    sums for every lagged (indicator, outcome) pair, and the last
+    max(2 * recent, max_lag) weeks of values for the recent/prior windows.
+
+        state = DriverState.from_weekly(weekly, metrics_ref)
+        state.append(new_week_rows); state.table()  # == driver_table(concatenated history)
+    """
+
+    def __init__(self, columns, recent=DEFAULT_RECENT, max_lag=DEFAULT_MAX_LAG, key="county", value_col=VALUE_COL,
+                 include_statewide=True):
+        self.columns, self.recent, self.max_lag = list(columns), recent, max_lag
+        self.key, self.value_col, self.include_statewide = key, value_col, include_statewide
+        self.depth = max(2 * recent, max_lag)
+        self.entities, self._index = [], {}
+        k, lags = len(self.columns), max_lag + 1
+        self._cx, self._cy = np.zeros((0, k)), np.zeros(0)
+        self._n, self._s1, self._s2 = np.zeros((0, k)), np.zeros((0, k)), np.zeros((0, k))
+        self._lag = np.zeros((6, lags, 0, k))  # n, sum a, sum b, sum ab, sum aa, sum bb
+        self._xbuf, self._ybuf = np.full((0, self.depth, k), np.nan), np.full((0, self.depth), np.nan)
+        self._last_date = np.array([], dtype="datetime64[ns]")
+
+    def _frame(self, weekly_df):
+        cols = [c for c in self.columns if c in weekly_df.columns]
+        frame = weekly_df[[self.key, "date", self.value_col, *cols]]
+        frame = frame[frame[self.key].notna()].reindex(columns=[self.key, "date", self.value_col, *self.columns])
+        if self.include_statewide and len(frame):
+            frame = pd.concat([frame.astype({self.key: object}),
+                               statewide(frame, [self.value_col, *self.columns], self.key)], ignore_index=True)
+        return frame.assign(date=pd.to_datetime(frame["date"], cache=False))
+
+    def _grow(self, new_entities, cx, cy):
+        k = len(new_entities)
+        for e in new_entities:
+            self._index[e] = len(self.entities)
+            self.entities.append(e)
+        K = len(self.columns)
+        self._cx, self._cy = np.vstack([self._cx, cx]), np.concatenate([self._cy, cy])
+        self._n, self._s1, self._s2 = (np.vstack([a, np.zeros((k, K))]) for a in (self._n, self._s1, self._s2))
+        self._lag = np.concatenate([self._lag, np.zeros((6, self.max_lag + 1, k, K))], axis=2)
+        self._xbuf = np.concatenate([self._xbuf, np.full((k, self.depth, K), np.nan)])
+        self._ybuf = np.concatenate([self._ybuf, np.full((k, self.depth), np.nan)])
+        self._last_date = np.concatenate([self._last_date, np.full(k, np.datetime64("NaT"), dtype="datetime64[ns]")])
+
+    # ---- construction ----
+    @classmethod
+    def from_weekly(cls, weekly_df, metrics_ref=None, recent=DEFAULT_RECENT, max_lag=DEFAULT_MAX_LAG, key="county",
+                    value_col=VALUE_COL, include_statewide=True):
+        state = cls(indicator_columns(weekly_df, metrics_ref, value_col), recent, max_lag, key, value_col,
+                    include_statewide)
+        if not state.columns:
+            return state
+        frame = state._frame(weekly_df).sort_values([key, "date"], kind="mergesort")
+        if not len(frame):
+            return state
+        codes, entities = pd.factorize(frame[key], sort=False)
+        counts = np.bincount(codes, minlength=len(entities))
+        ends = np.cumsum(counts)
+        starts = ends - counts
+        N, H = len(codes), state.depth
+        i = np.arange(N)
+        pos, back = i - starts[codes], ends[codes] - 1 - i
+
+        X = frame[state.columns].to_numpy(dtype=float)
+        ok = ~np.isnan(X)
+        y = frame[value_col].to_numpy(dtype=float)
+        y_ok = ~np.isnan(y)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cx = np.nan_to_num(_gsum(np.where(ok, X, 0.0), starts) / _gsum(ok.astype(float), starts))
+            cy = np.nan_to_num(_gsum(np.where(y_ok, y, 0.0), starts) / _gsum(y_ok.astype(float), starts))
+        state._grow(list(entities), cx, cy)
+        dev = np.where(ok, X - cx[codes], 0.0)
+        yc = np.where(y_ok, y - cy[codes], 0.0)
+        state._n, state._s1, state._s2 = _gsum(ok.astype(float), starts), _gsum(dev, starts), _gsum(dev * dev, starts)
+        # Lagged pairs: indicator at t-lag vs outcome at t, within the same entity.
+        for lag in range(max_lag + 1):
+            xs, xs_ok = np.zeros_like(dev), np.zeros_like(ok)
+            xs[lag:], xs_ok[lag:] = dev[:N - lag], ok[:N - lag]
+            m = xs_ok & (y_ok & (pos >= lag))[:, None]
+            a, b = np.where(m, xs, 0.0), np.where(m, yc[:, None], 0.0)
+            state._lag[:, lag] = [_gsum(v, starts) for v in (m.astype(float), a, b, a * b, a * a, b * b)]
+        tail = back < H
+        state._xbuf[codes[tail], H - 1 - back[tail]] = X[tail]
+        state._ybuf[codes[tail], H - 1 - back[tail]] = y[tail]
+        state._last_date = frame["date"].to_numpy(dtype="datetime64[ns]")[ends - 1]
+        return state
+
+    # ---- updates ----
+    def append(self, new_rows):
+        """Fold in weeks newer than each entity's last (county rows; the statewide row is derived)."""
+        if not self.columns:
+            return 0
+        frame = self._frame(new_rows).drop_duplicates([self.key, "date"], keep="last")
+        if not len(frame):
+            return 0
+        fresh_entities = [e for e in pd.unique(frame[self.key]) if e not in self._index]
+        if fresh_entities:
+            first = frame.drop_duplicates(self.key).set_index(self.key).loc[fresh_entities]
+            self._grow(fresh_entities, np.nan_to_num(first[self.columns].to_numpy(dtype=float)),
+                       np.nan_to_num(first[self.value_col].to_numpy(dtype=float)))
+        codes = frame[self.key].map(self._index).to_numpy(dtype=np.int64)
+        dates = frame["date"].to_numpy(dtype="datetime64[ns]")
+        keep = np.isnat(self._last_date[codes]) | (dates > self._last_date[codes])
+        frame, codes, dates = frame[keep], codes[keep], dates[keep]
+        X = frame[self.columns].to_numpy(dtype=float)
+        y = frame[self.value_col].to_numpy(dtype=float)
+        for d in np.unique(dates):  # usually a single week
+            m = dates == d
+            e, x, yv = codes[m], X[m], y[m]
+            ok = ~np.isnan(x)
+            dev = np.where(ok, x - self._cx[e], 0.0)
+            self._n[e] += ok
+            self._s1[e] += dev
+            self._s2[e] += dev * dev
+            y_ok = ~np.isnan(yv)
+            b_all = np.where(y_ok, yv - self._cy[e], 0.0)[:, None]
+            for lag in range(self.max_lag + 1):
+                xa = x if lag == 0 else self._xbuf[e, self.depth - lag]
+                pair = ~np.isnan(xa) & y_ok[:, None]
+                a = np.where(pair, xa - self._cx[e], 0.0)
+                b = np.where(pair, b_all, 0.0)
+                for j, v in enumerate((pair.astype(float), a, b, a * b, a * a, b * b)):
+                    self._lag[j, lag, e] += v
+            self._xbuf[e, :-1], self._xbuf[e, -1] = self._xbuf[e, 1:], x
+            self._ybuf[e, :-1], self._ybuf[e, -1] = self._ybuf[e, 1:], yv
+            self._last_date[e] = d
+        return int(keep.sum())
+
+    # ---- output ----
+    def table(self):
+        """The `driver_table` frame for everything seen so far."""
+        label = "County" if self.key == "county" else self.key
+        if not self.entities or not self.columns:
+            return pd.DataFrame(columns=[label, *_TABLE_COLS])
+        K, R, H = len(self.columns), self.recent, self.depth
+        n = self._n
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sd = np.sqrt((self._s2 - self._s1 * self._s1 / n) / (n - 1))
+
+            def window_mean(lo, hi):
+                w = self._xbuf[:, H - hi:H - lo]
+                ok = ~np.isnan(w)
+                return np.where(ok, w, 0.0).sum(axis=1) / ok.sum(axis=1)
+
+            recent_mean, prior_mean = window_mean(0, R), window_mean(R, 2 * R)
+            change = recent_mean - prior_mean
+            pct = np.where(prior_mean != 0, change / prior_mean * 100, 0.0)
+            z = np.where(sd > 0, change / sd, np.nan)
+            cnt, sa, sb, sab, saa, sbb = self._lag
+            cov, va, vb = sab - sa * sb / cnt, saa - sa * sa / cnt, sbb - sb * sb / cnt
+            corr = np.where((va > 0) & (vb > 0) & (cnt > 2), cov / np.sqrt(va * vb), np.nan)
+        best = np.argmax(np.nan_to_num(np.abs(corr), nan=-1.0), axis=0)
+        lag_corr = np.take_along_axis(corr, best[None], axis=0)[0]
+
+        return pd.DataFrame({
+            label: np.repeat(np.asarray(self.entities, dtype=object), K),
+            "Indicator": np.tile(self.columns, len(self.entities)),
+            "Recent_Mean": recent_mean.ravel(), "Prior_Mean": prior_mean.ravel(),
+            "Pct_Change": pct.ravel(), "Z_Score": z.ravel(),
+            "Lag_Corr": lag_corr.ravel(), "Best_Lag_Weeks": np.where(np.isnan(lag_corr), -1, best).ravel(),
+        })
+
+
+def driver_table(weekly_df, metrics_ref=None, recent=DEFAULT_RECENT, max_lag=DEFAULT_MAX_LAG,
+                 key="county", value_col=VALUE_COL, include_statewide=True):
+    """One row per (entity, indicator).
+
+    `Pct_Change` compares the last `recent` weeks with the `recent` weeks
+    before; `Z_Score` is that change in units of the entity's weekly std for
+    the indicator. `Lag_Corr` is the strongest correlation between the
+    indicator `Best_Lag_Weeks` earlier (0..max_lag) and `value_col`.
+    """
+    return DriverState.from_weekly(weekly_df, metrics_ref, recent, max_lag, key, value_col, include_statewide).table()
+
+
+def top_drivers(table, entity=STATEWIDE, n=5, key="County"):
+    """The `n` indicators with the largest standardized recent change for `entity`."""
+    rows = table[table[key] == entity]
+    order = rows["Z_Score"].abs().sort_values(ascending=False, na_position="last", kind="mergesort").index
+    return rows.loc[order].head(n).reset_index(drop=True)
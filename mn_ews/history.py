@@ -0,0 +1,216 @@
+"""Local SQLite history of weekly risk overviews and latest snapshots.
+
+Both tables are keyed by (county, as_of_date) with a secondary index on
+as_of_date, so week-over-week transitions, status streaks and per-county
+history are index lookups rather than re-scoring old CSVs:
+
+    python -m mn_ews.history --backfill          # score every week of the weekly history once
+    python -m mn_ews.history --changes --streaks
+"""
+import argparse
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+from .paths import BASE_DIR
+from .scoring import DEFAULT_HORIZON, DEFAULT_THRESHOLDS, DEFAULT_WINDOW, rag_from_prob
+from .storage import COUNT_COLS, INDEX_COLS
+
+DEFAULT_DB = os.environ.get("MN_EWS_HISTORY_DB", str(BASE_DIR / "ews_history.sqlite"))
+MEASURES = COUNT_COLS + INDEX_COLS
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS overview (
+    county TEXT NOT NULL,
+    as_of_date TEXT NOT NULL,
+    prob_spike REAL,
+    rag_status TEXT,
+    lead_time_weeks INTEGER,
+    PRIMARY KEY (county, as_of_date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS overview_as_of ON overview (as_of_date, rag_status);
+CREATE TABLE IF NOT EXISTS snapshot (
+    county TEXT NOT NULL,
+    as_of_date TEXT NOT NULL,
+    {", ".join(f"{c} REAL" for c in MEASURES)},
+    prob_spike REAL,
+    rag_status TEXT,
+    PRIMARY KEY (county, as_of_date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS snapshot_as_of ON snapshot (as_of_date);
+"""
+
+_CHANGE_COLS = ["County", "Previous_RAG", "RAG_Status", "Previous_Prob", "Prob_Spike_8w", "Change"]
+_RANK = {"Green": 0, "Amber": 1, "Red": 2}
+
+
+def _records(df, cols):
+    """Plain Python tuples for executemany; NaN becomes NULL."""
+    frame = df[cols].astype(object)
+    return list(frame.where(frame.notna(), None).itertuples(index=False, name=None))
+
+
+def _iso(d):
+    return None if d is None else str(pd.Timestamp(d).date())
+
+
+class HistoryStore:
+    """Append-only (upsert) store of weekly overviews/snapshots with transition and streak queries."""
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = str(path)
+        # one connection shared across threads (e.g. Streamlit sessions); every statement runs under the lock
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        if self.path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    # ---- Writes ----
+    def record_overview(self, overview, as_of=None):
+        """Upsert one overview (`County`, `Prob_Spike_8w`, `RAG_Status`, ...); returns rows written."""
+        df = overview.rename(columns={"County": "county"})
+        dates = pd.to_datetime(df["As_Of_Date"]).dt.strftime("%Y-%m-%d") if as_of is None else _iso(as_of)
+        df = df.assign(as_of_date=dates, county=df["county"].astype(str))
+        if "Lead_Time_Weeks" not in df.columns:
+            df = df.assign(Lead_Time_Weeks=None)
+        rows = _records(df, ["county", "as_of_date", "Prob_Spike_8w", "RAG_Status", "Lead_Time_Weeks"])
+        with self._lock, self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO overview VALUES (?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def record_snapshot(self, latest):
+        """Upsert latest-week rows (`county`, `date`, the weekly measures, probability and RAG)."""
+        df = latest.assign(as_of_date=pd.to_datetime(latest["date"]).dt.strftime("%Y-%m-%d"))
+        df = df.reindex(columns=["county", "as_of_date", *MEASURES, "Prob_Spike_8w", "RAG_Status"])
+        rows = _records(df, list(df.columns))
+        with self._lock, self.conn:
+            self.conn.executemany(f"INSERT OR REPLACE INTO snapshot VALUES ({', '.join('?' * len(df.columns))})", rows)
+        return len(rows)
+
+    def record(self, overview, latest=None):
+        n = self.record_overview(overview)
+        if latest is not None and {"county", "date"} <= set(latest.columns):
+            self.record_snapshot(latest)
+        return n
+
+    def backfill(self, weekly_df, window=DEFAULT_WINDOW, thresholds=DEFAULT_THRESHOLDS, horizon=DEFAULT_HORIZON):
+        """Score every historical week in one pass and upsert it as that week's overview."""
+        from .backtest import rolling_scores
+        scored = rolling_scores(weekly_df, window)[0]
+        scored = scored.assign(As_Of_Date=scored["date"],
+                               RAG_Status=rag_from_prob(scored["Prob_Spike_8w"].to_numpy(), thresholds),
+                               Lead_Time_Weeks=horizon)
+        return self.record_overview(scored)
+
+    # ---- Queries ----
+    def _df(self, sql, params=()):
+        with self._lock:
+            return pd.read_sql_query(sql, self.conn, params=params)
+
+    def _fetch(self, sql, params=()):
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def dates(self):
+        return [r[0] for r in self._fetch("SELECT DISTINCT as_of_date FROM overview ORDER BY as_of_date")]
+
+    def latest_date(self, before=None):
+        """Most recent stored as-of date (strictly before `before` when given)."""
+        if before is None:
+            rows = self._fetch("SELECT MAX(as_of_date) FROM overview")
+        else:
+            rows = self._fetch("SELECT MAX(as_of_date) FROM overview WHERE as_of_date < ?", (_iso(before),))
+        return rows[0][0]
+
+    def history(self, county, start=None, end=None):
+        """One county's stored weeks, oldest first."""
+        return self._df(
+            "SELECT as_of_date AS As_Of_Date, prob_spike AS Prob_Spike_8w, rag_status AS RAG_Status "
+            "FROM overview WHERE county = ? AND as_of_date BETWEEN ? AND ? ORDER BY as_of_date",
+            (county, _iso(start) or "0000", _iso(end) or "9999"))
+
+    def transitions(self, as_of=None, since=None, changed_only=True):
+        """Each county's RAG at `as_of` against the previous stored week (or `since`).
+
+        `Change` is e.g. "Amber→Red", "new" for counties absent the week before,
+        or "unchanged"; escalations sort first.
+        """
+        cur = _iso(as_of) or self.latest_date()
+        prev = _iso(since) or self.latest_date(before=cur)
+        df = self._df(
+            "SELECT c.county AS County, p.rag_status AS Previous_RAG, c.rag_status AS RAG_Status, "
+            "p.prob_spike AS Previous_Prob, c.prob_spike AS Prob_Spike_8w "
+            "FROM overview c LEFT JOIN overview p ON p.county = c.county AND p.as_of_date = ? "
+            "WHERE c.as_of_date = ?", (prev, cur))
+        df["Change"] = [("new" if p is None else "unchanged" if p == r else f"{p}→{r}")
+                        for p, r in zip(df["Previous_RAG"], df["RAG_Status"])]
+        if changed_only:
+            df = df[df["Change"] != "unchanged"]
+        step = df["RAG_Status"].map(_RANK).fillna(0) - df["Previous_RAG"].map(_RANK).fillna(-1)
+        df = df.assign(_step=step).sort_values(["_step", "Prob_Spike_8w"], ascending=False, kind="mergesort")
+        out = df.drop(columns="_step").reset_index(drop=True)[_CHANGE_COLS]
+        out.attrs.update(as_of=cur, since=prev)
+        return out
+
+    def streaks(self, as_of=None, county=None):
+        """How many consecutive stored weeks each county has held its status as of `as_of`."""
+        cur = _iso(as_of) or self.latest_date()
+        sql = (
+            "SELECT c.county AS County, c.rag_status AS RAG_Status, COUNT(*) AS Weeks_In_Status, "
+            "MIN(o.as_of_date) AS Since "
+            "FROM overview c JOIN overview o ON o.county = c.county AND o.as_of_date <= c.as_of_date "
+            "AND o.as_of_date > COALESCE((SELECT MAX(x.as_of_date) FROM overview x WHERE x.county = c.county "
+            "AND x.as_of_date < c.as_of_date AND x.rag_status IS NOT c.rag_status), '') "
+            "WHERE c.as_of_date = ?" + (" AND c.county = ?" if county is not None else "") +
+            " GROUP BY c.county, c.rag_status ORDER BY Weeks_In_Status DESC, County")
+        return self._df(sql, (cur,) if county is None else (cur, county))
+
+    def changes_since_last_week(self, as_of=None):
+        """Changed counties with how long they have held the new status (the dashboard/PDF view)."""
+        changes = self.transitions(as_of)
+        if changes.empty:
+            return changes
+        streaks = self.streaks(changes.attrs["as_of"])[["County", "Weeks_In_Status", "Since"]]
+        out = changes.merge(streaks, on="County", how="left")
+        out.attrs.update(changes.attrs)
+        return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Query or backfill the local EWS snapshot history.")
+    ap.add_argument("--db", default=DEFAULT_DB)
+    ap.add_argument("--backfill", action="store_true", help="score every week of the weekly inputs into the store")
+    ap.add_argument("--changes", action="store_true", help="RAG transitions since the previous stored week")
+    ap.add_argument("--streaks", action="store_true", help="weeks each county has held its current status")
+    ap.add_argument("--county", help="print this county's stored history")
+    ap.add_argument("--as-of", help="as-of date for --changes/--streaks (default: latest stored)")
+    args = ap.parse_args(argv)
+
+    store = HistoryStore(args.db)
+    if args.backfill:
+        from .data import load_or_embed_all
+        from .rollup import county_level
+        n = store.backfill(county_level(load_or_embed_all()[3]))
+        print(f"Backfilled {n:,} county-weeks into {args.db}")
+    with pd.option_context("display.width", 200, "display.max_rows", 200):
+        if args.changes:
+            ch = store.transitions(args.as_of)
+            print(f"Changes {ch.attrs['since']} → {ch.attrs['as_of']}:")
+            print(ch.to_string(index=False) if not ch.empty else "  none")
+        if args.streaks:
+            print(store.streaks(args.as_of).to_string(index=False))
+        if args.county:
+            print(store.history(args.county).to_string(index=False))
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
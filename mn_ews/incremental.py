@@ -0,0 +1,138 @@
+"""Incremental weekly ingestion: keep per-county rolling state, update in O(counties)."""
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from .scoring import (DEFAULT_HORIZON, DEFAULT_THRESHOLDS, DEFAULT_WINDOW, VALUE_COL,
+                      rag_from_prob, spike_probability)
+
+
+class RollingRiskState:
+    """Ring buffer of the last `window` values per entity plus the latest full row.
+
+    Build it once from the full history with `from_weekly`, then feed each new
+    week's rows to `append`; `overview()` and `latest_snapshot()` match what
+    `make_overview` / the loader would produce from the concatenated history.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW, thresholds=DEFAULT_THRESHOLDS,
+                 horizon=DEFAULT_HORIZON, key="county", value_col=VALUE_COL):
+        self.window, self.thresholds, self.horizon = window, tuple(thresholds), horizon
+        self.key, self.value_col = key, value_col
+        self.entities = []
+        self._index = {}
+        self._buf = np.full((0, window), np.nan)
+        self._head = np.zeros(0, dtype=np.int64)
+        self._n = np.zeros(0, dtype=np.int64)
+        self._last_date = np.array([], dtype="datetime64[ns]")
+        self._latest = None
+        self.as_of = None
+        self.weeks_appended = 0
+
+    # ---- construction ----
+    @classmethod
+    def from_weekly(cls, weekly_df, **kwargs):
+        state = cls(**kwargs)
+        key, w = state.key, state.window
+        df = weekly_df[weekly_df[key].notna()].sort_values([key, "date"], kind="mergesort")
+        codes, uniques = pd.factorize(df[key], sort=False)
+        state._grow(list(uniques))
+        counts = np.bincount(codes, minlength=len(uniques))
+        starts = np.cumsum(counts) - counts
+        pos = np.arange(len(df)) - starts[codes]
+        offset = pos - (counts - np.minimum(counts, w))[codes]
+        keep = offset >= 0
+        state._buf[codes[keep], offset[keep]] = df[state.value_col].to_numpy(dtype=float)[keep]
+        state._n = np.minimum(counts, w)
+        state._head = state._n % w
+        tail = df.groupby(key, sort=False, observed=True).tail(1)
+        state._last_date = pd.to_datetime(tail["date"]).to_numpy(dtype="datetime64[ns]")
+        state._latest = tail.set_index(key)
+        state.as_of = pd.to_datetime(df["date"]).max() if len(df) else None
+        return state
+
+    def _grow(self, new_entities):
+        k = len(new_entities)
+        if not k:
+            return
+        for e in new_entities:
+            self._index[e] = len(self.entities)
+            self.entities.append(e)
+        self._buf = np.vstack([self._buf, np.full((k, self.window), np.nan)])
+        self._head = np.concatenate([self._head, np.zeros(k, dtype=np.int64)])
+        self._n = np.concatenate([self._n, np.zeros(k, dtype=np.int64)])
+        self._last_date = np.concatenate([self._last_date, np.full(k, np.datetime64("NaT"), dtype="datetime64[ns]")])
+
+    # ---- updates ----
+    def append(self, new_rows):
+        """Ingest new weekly rows; rows not newer than an entity's last week are ignored."""
+        key = self.key
+        rows = new_rows[new_rows[key].notna()].copy()
+        rows["date"] = pd.to_datetime(rows["date"], cache=False)
+        self._grow([e for e in pd.unique(rows[key]) if e not in self._index])
+        rows = rows.sort_values("date", kind="mergesort").drop_duplicates([key, "date"], keep="last")
+        codes = rows[key].map(self._index).to_numpy(dtype=np.int64)
+        dates = rows["date"].to_numpy(dtype="datetime64[ns]")
+        fresh = np.isnat(self._last_date[codes]) | (dates > self._last_date[codes])
+        rows, codes, dates = rows[fresh], codes[fresh], dates[fresh]
+        if rows.empty:
+            return 0
+        values = rows[self.value_col].to_numpy(dtype=float)
+        for d in np.unique(dates):  # usually a single week
+            m = dates == d
+            c = codes[m]
+            self._buf[c, self._head[c]] = values[m]
+            self._head[c] = (self._head[c] + 1) % self.window
+            self._n[c] = np.minimum(self._n[c] + 1, self.window)
+            self._last_date[c] = d
+            self.weeks_appended += 1
+        newest = rows.groupby(key, sort=False, observed=True).tail(1).set_index(key)
+        self._latest = newest if self._latest is None else pd.concat(
+            [self._latest.drop(index=newest.index, errors="ignore"), newest])
+        newest_date = pd.Timestamp(dates.max())
+        self.as_of = newest_date if self.as_of is None else max(self.as_of, newest_date)
+        return len(rows)
+
+    # ---- outputs ----
+    def scores(self):
+        """Per-entity mean, std and (z, p) with `score_weekly`'s rule: missing slots are skipped."""
+        buf = self._buf
+        valid = ~np.isnan(buf)  # unfilled slots are NaN too
+        n = valid.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mu = np.where(valid, buf, 0.0).sum(axis=1) / n
+            dev = np.where(valid, buf - mu[:, None], 0.0)
+            ss = (dev * dev).sum(axis=1)
+            sd = np.where(n > 1, np.sqrt(ss / (n - 1)), np.nan)
+        last = buf[np.arange(len(n)), (self._head - 1) % self.window]
+        return mu, sd, spike_probability(last, mu, sd)
+
+    def overview(self):
+        _, _, (_, p) = self.scores()
+        out = pd.DataFrame({
+            "County" if self.key == "county" else self.key: self.entities,
+            "Prob_Spike_8w": p,
+            "RAG_Status": rag_from_prob(p, self.thresholds),
+            "As_Of_Date": str(self.as_of.date()) if self.as_of is not None else None,
+            "Lead_Time_Weeks": self.horizon,
+        })
+        return out.sort_values("Prob_Spike_8w", ascending=False, kind="mergesort").reset_index(drop=True)
+
+    def latest_snapshot(self):
+        """Rows reported in the newest week, joined with their current risk."""
+        if self._latest is None:
+            return None
+        latest = self._latest[pd.to_datetime(self._latest["date"], cache=False) == self.as_of].reset_index()
+        ov = self.overview().rename(columns={"County": self.key})
+        return latest.merge(ov[[self.key, "Prob_Spike_8w", "RAG_Status", "Lead_Time_Weeks"]], on=self.key, how="left")
+
+    # ---- persistence ----
+    def save(self, path):
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path):
+        with open(path, "rb") as f:
+            return pickle.load(f)
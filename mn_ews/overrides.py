@@ -0,0 +1,204 @@
+"""County-specific recommended actions with generic RAG fallbacks."""
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+from .paths import DATA_DIR
+
+DEFAULT_OVERRIDES = {
+    "Hennepin County": {
+        "Red": [
+            "Activate city–county joint coordination with DHS/MDE; embed liaison to EOC if active.",
+            "Expand emergency meal sites with weekend kits; coordinate with Metro Transit for last-mile access.",
+            "Same-day SNAP interviews; multilingual SMS (Spanish, Somali, Hmong) via county partners."
+        ],
+        "Amber": [
+            "Pre-stage shelf-stable items at high-throughput pantries; confirm extended hours.",
+            "Target hotspot ZIPs with SNAP outreach through clinics and schools.",
+            "Notify school nutrition directors; prepare weekend kits."
+        ],
+        "Green": [
+            "Baseline SNAP outreach via community partners.",
+            "Monthly drift checks and dashboard sharing with city/county partners."
+        ]
+    },
+    "Ramsey County": {
+        "Red": [
+            "Scale Saint Paul meal sites and weekend/holiday kits in coordination with MDE.",
+            "Stand up SNAP surge staffing; enable walk-in interviews at Service Center.",
+            "Partner with culturally specific CBOs for outreach (e.g., Hmong, Karen, Somali)."
+        ],
+        "Amber": [
+            "Advance TEFAP orders; stage food bank inventory for East Side hotspots.",
+            "Coordinate with SPPS for breakfast expansion and backpack programs.",
+            "Targeted SNAP outreach in transit-poor corridors."
+        ],
+        "Green": [
+            "Maintain baseline pantry logistics and SNAP outreach.",
+            "Monthly QA on forecasts; share brief with county board staff."
+        ]
+    },
+    "St. Louis County": {
+        "Any": [
+            "Coordinate with regional food banks for northland delivery constraints.",
+            "Target SNAP outreach in rural ZIPs; leverage school bus routes for kit distribution.",
+            "Engage tribal partners on culturally appropriate food distribution."
+        ]
+    }
+}
+
+def recommended_actions_for_rag(rag: str):
+    rag = (rag or "").strip().title()
+    if rag == "Red":
+        return [
+            "Pre-position TEFAP and food shelf inventory with regional food banks.",
+            "Stand up emergency meal sites (SSO/SFSP windows where eligible); include weekend/holiday kits.",
+            "Expedite SNAP processing: same-day interviews; reminders for verifications.",
+            "Coordinate with county HHS on emergency housing/utility supports.",
+            "Run weekly incident-style command huddles; monitor pantry throughput daily."
+        ]
+    if rag == "Amber":
+        return [
+            "Alert school nutrition directors; prep weekend meal kits; watch NSLP/SBP vs enrollment.",
+            "Target SNAP outreach in forecast hotspots; promote online apps and phone interviews.",
+            "Advance TEFAP orders; stage shelf-stable items; confirm pantry extended hours.",
+            "Review staffing vs. caseload; prepare surge schedules."
+        ]
+    return [
+        "Maintain baseline SNAP outreach and pantry logistics.",
+        "Monthly forecast QA and drift checks; validate vs observed trends.",
+        "Share dashboards with county partners; sustain data-sharing (SNAP, NSLP, pantry)."
+    ]
+
+def load_overrides(uploaded_json, data_dir=DATA_DIR):
+    try:
+        if uploaded_json is not None:
+            return json.load(uploaded_json)
+    except Exception:
+        pass
+    try:
+        p = Path(data_dir) / "county_overrides.json"
+        if p.exists():
+            with open(p, "r") as f:
+                return json.load(f)
+    except Exception:
+        pass
+    return DEFAULT_OVERRIDES
+
+def recommended_actions_for_county(county: str, rag: str, overrides: dict):
+    if isinstance(overrides, CompiledOverrides):
+        return overrides.lookup(county, rag)
+    c = (county or "").strip()
+    r = (rag or "").strip().title()
+    if c in overrides and isinstance(overrides[c], dict) and r in overrides[c]:
+        return overrides[c][r], True
+    if c in overrides and isinstance(overrides[c], dict) and "Any" in overrides[c]:
+        return overrides[c]["Any"], True
+    return recommended_actions_for_rag(r), False
+
+# --------------- Compiled overrides index --------------------
+class CompiledOverrides:
+    """Overrides validated once and flattened to a (county, RAG) -> actions table.
+
+    Resolution matches `recommended_actions_for_county`: an exact RAG entry,
+    then the county's "Any" entry, then the generic RAG defaults.
+    """
+
+    def __init__(self, overrides):
+        self.table, self.any, self.problems = {}, {}, []
+        for county, spec in (overrides or {}).items():
+            if not isinstance(spec, dict):
+                self.problems.append(f"{county}: expected an object of RAG -> actions, got {type(spec).__name__}")
+                continue
+            c = str(county).strip()
+            for rag, acts in spec.items():
+                if isinstance(acts, str):
+                    acts = [acts]
+                if not isinstance(acts, list) or not all(isinstance(a, str) for a in acts):
+                    self.problems.append(f"{county}/{rag}: actions must be a list of strings")
+                    continue
+                if rag == "Any":
+                    self.any[c] = tuple(acts)
+                else:
+                    self.table[(c, rag)] = tuple(acts)
+        self.defaults = {r: tuple(recommended_actions_for_rag(r)) for r in ("Red", "Amber", "Green")}
+
+    def lookup(self, county, rag):
+        c = (county or "").strip()
+        r = (rag or "").strip().title()
+        acts = self.table.get((c, r))
+        if acts is None:
+            acts = self.any.get(c)
+        if acts is not None:
+            return list(acts), True
+        return list(self.defaults.get(r, self.defaults["Green"])), False
+
+    def attach(self, df, county_col="County", rag_col="RAG_Status", n=3, sep=" | "):
+        """Add `Recommended_Action_Summary` and `Actions_Customized` to a whole overview frame."""
+        out = df.copy()
+        keys = out[county_col].astype(str).str.strip() + "\x1f" + out[rag_col].astype(str).str.strip().str.title()
+        resolved = {k: self.lookup(*k.split("\x1f", 1)) for k in keys.unique()}
+        out["Recommended_Action_Summary"] = keys.map({k: sep.join(a[:n]) for k, (a, _) in resolved.items()})
+        out["Actions_Customized"] = keys.map({k: custom for k, (_, custom) in resolved.items()})
+        return out
+
+
+_compiled_lock = threading.Lock()
+_compiled_by_digest = {}
+_compiled_by_path = {}
+
+
+def compile_overrides(overrides):
+    return overrides if isinstance(overrides, CompiledOverrides) else CompiledOverrides(overrides)
+
+
+def _compile_bytes(data):
+    """Compiled overrides for raw JSON bytes, memoized by content hash; None if unparseable."""
+    digest = hashlib.sha256(data).hexdigest()
+    with _compiled_lock:
+        if digest in _compiled_by_digest:
+            return _compiled_by_digest[digest]
+    try:
+        compiled = CompiledOverrides(json.loads(data))
+    except Exception:
+        compiled = None
+    with _compiled_lock:
+        _compiled_by_digest[digest] = compiled
+    return compiled
+
+
+_default_compiled = None
+
+
+def _defaults():
+    global _default_compiled
+    if _default_compiled is None:
+        _default_compiled = CompiledOverrides(DEFAULT_OVERRIDES)
+    return _default_compiled
+
+
+def load_compiled_overrides(uploaded_json=None, data_dir=DATA_DIR):
+    """Compiled overrides from an upload, else `county_overrides.json`, else the defaults.
+
+    The file is re-read only when its mtime or size changes, and re-compiled
+    only when its content hash changes.
+    """
+    if uploaded_json is not None:
+        data = uploaded_json.getvalue() if hasattr(uploaded_json, "getvalue") else uploaded_json.read()
+        compiled = _compile_bytes(data if isinstance(data, bytes) else data.encode())
+        if compiled is not None:
+            return compiled
+    p = Path(data_dir) / "county_overrides.json"
+    try:
+        st = p.stat()
+    except OSError:
+        return _defaults()
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _compiled_lock:
+        cached = _compiled_by_path.get(str(p))
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, _compile_bytes(p.read_bytes()))
+        with _compiled_lock:
+            _compiled_by_path[str(p)] = cached
+    return cached[1] or _defaults()
@@ -0,0 +1,6 @@
+"""Default locations of bundled inputs; the loaders also fall back to the working directory."""
+import os
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = Path(os.environ.get("MN_EWS_DATA_DIR", BASE_DIR / "data"))
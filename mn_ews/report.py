@@ -0,0 +1,112 @@
+"""Branded executive-summary PDF. reportlab and matplotlib are imported on first use."""
+import io
+from datetime import datetime
+
+from . import charts
+from .overrides import compile_overrides, load_compiled_overrides
+from .paths import DATA_DIR
+
+PRIMARY = "#0B5FFF"
+BORDER  = "#E5E7EB"
+
+
+def top10_chart_png(overview):
+    df_tmp = overview.sort_values("Prob_Spike_8w", ascending=False).head(10)
+    return charts.bar_chart(df_tmp, "County", "Prob_Spike_8w", "Top 10 Counties — 8-week Spike Probability",
+                            ylabel="Probability", ylim=(0, 1))
+
+
+def trend_chart_png(county_series, county):
+    return charts.line_chart(county_series, "Food_Shelf_Visits", f"Food Shelf Visits — {county}",
+                             xlabel="Date", ylabel="Weekly Visits")
+
+
+def executive_summary_pdf(overview, county_series, county_for_pdf, playbook, as_of=None,
+                          include_playbook=True, data_dir=DATA_DIR, overrides=None,
+                          top10_png=None, trend_png=None, county_focus=False, changes=None):
+    """Render the one-page (overflowing) summary; `county_series` is the county's sorted weekly rows.
+
+    Pre-rendered `top10_png`/`trend_png` bytes are used as-is, so batch runs can
+    render shared charts once. `county_focus` adds the county's own status and actions;
+    `changes` (from `HistoryStore.changes_since_last_week`) adds week-over-week RAG moves.
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import LETTER
+    from reportlab.lib.units import inch
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=LETTER)
+    W, H = LETTER; M = 0.6*inch
+    # header band
+    c.setFillColor(colors.HexColor(PRIMARY)); c.rect(0, H-30, W, 30, fill=True, stroke=False)
+    c.setFillColor(colors.white); c.setFont("Helvetica-Bold", 12)
+    c.drawString(M, H-22, "Minnesota Food Insecurity EWS — Executive Summary")
+    y = H - 50
+    # as-of + RAG counts
+    c.setFillColor(colors.black); c.setFont("Helvetica", 10)
+    c.drawString(M, y, f"As of: {as_of or '—'}   Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}"); y -= 16
+    red_ct = int((overview['RAG_Status']=='Red').sum()); amber_ct = int((overview['RAG_Status']=='Amber').sum()); green_ct = int((overview['RAG_Status']=='Green').sum())
+    c.setFont("Helvetica-Bold", 11); c.drawString(M, y, "Current RAG Status (Counties)"); y -= 14
+    c.setFont("Helvetica", 10); c.drawString(M, y, f"Red: {red_ct}   Amber: {amber_ct}   Green: {green_ct}"); y -= 18
+    # week-over-week RAG changes from the snapshot history
+    if changes is not None and not changes.empty and changes.attrs.get("since"):
+        c.setFont("Helvetica-Bold", 11); c.drawString(M, y, f"Changes Since Last Week ({changes.attrs['since']})"); y -= 14
+        c.setFont("Helvetica", 9)
+        for _, row in changes.head(8).iterrows():
+            c.drawString(M+14, y, f"• {row['County']}: {row['Change']} ({row['Prob_Spike_8w']:.0%})"); y -= 12
+        if len(changes) > 8:
+            c.drawString(M+14, y, f"… and {len(changes) - 8} more"); y -= 12
+        y -= 6
+    # top-10 chart
+    df_tmp = overview.sort_values("Prob_Spike_8w", ascending=False).head(10)
+    try:
+        img = ImageReader(io.BytesIO(top10_png or top10_chart_png(overview))); img_w = W - 2*M; img_h = img_w * 0.45
+        c.drawImage(img, M, y - img_h, width=img_w, height=img_h, mask='auto'); y -= (img_h + 10)
+    except Exception: pass
+    # use file/default for PDF unless the caller resolved overrides already
+    overrides = load_compiled_overrides(None, data_dir) if overrides is None else compile_overrides(overrides)
+    # County focus: the packet county's own status and actions
+    if county_focus:
+        mine = overview[overview["County"] == county_for_pdf]
+        if not mine.empty:
+            rag = mine["RAG_Status"].iloc[0]; prob = float(mine["Prob_Spike_8w"].iloc[0])
+            acts, custom = overrides.lookup(county_for_pdf, rag)
+            c.setFont("Helvetica-Bold", 11); c.drawString(M, y, f"{county_for_pdf} — {rag} (8-week spike probability {prob:.0%})"); y -= 14
+            c.setFont("Helvetica", 9)
+            for act in acts:
+                c.drawString(M+14, y, u"• " + act[:100]); y -= 12
+            y -= 6
+    # Recommended actions: top 3 counties (with overrides)
+    c.setFont("Helvetica-Bold", 11); c.drawString(M, y, "Recommended Actions — Top 3 Counties"); y -= 14
+    c.setFont("Helvetica", 9)
+    for _, row in df_tmp.head(3).iterrows():
+        county = row["County"]; rag = row["RAG_Status"]
+        acts, custom = overrides.lookup(county, rag)
+        c.drawString(M, y, f"{county} ({rag})" + (" — customized" if custom else "")); y -= 12
+        for act in acts[:3]:
+            c.drawString(M+14, y, u"• " + act[:100]); y -= 12
+            if y < M + 0.8*inch:
+                c.showPage(); c.setFont("Helvetica-Bold", 12); c.drawString(M, LETTER[1]-40, "Recommended Actions (cont.)"); y = LETTER[1]-60
+        y -= 4
+    # county trend
+    try:
+        img2 = ImageReader(io.BytesIO(trend_png or trend_chart_png(county_series, county_for_pdf))); img_w2 = W - 2*M; img_h2 = img_w2 * 0.35
+        if y - img_h2 < M:
+            c.showPage(); c.setFont("Helvetica-Bold", 12); c.drawString(M, LETTER[1]-40, "Executive Summary (cont.)"); y = LETTER[1] - 60
+        c.drawImage(img2, M, y - img_h2, width=img_w2, height=img_h2, mask='auto'); y -= (img_h2 + 10)
+    except Exception: pass
+    # optional playbook summary
+    if include_playbook and playbook is not None:
+        if y < 1.5*inch:
+            c.showPage(); c.setFont("Helvetica-Bold", 12); c.drawString(M, LETTER[1]-40, "RAG Playbook"); y = LETTER[1]-60
+        c.setFont("Helvetica-Bold", 11); c.drawString(M, y, "RAG Action Playbook — Summary"); y -= 14
+        c.setFont("Helvetica", 9)
+        for _, row in playbook.head(6).iterrows():
+            text = f"- {row.get('County','?')}: {row.get('RAG_Status','?')}; Lead: {row.get('Lead Agency','?')}; Cadence: {row.get('Governance Cadence','?')}"
+            c.drawString(M, y, text[:120]); y -= 12
+            if y < M:
+                c.showPage(); c.setFont("Helvetica-Bold", 12); c.drawString(M, LETTER[1]-40, "RAG Playbook (cont.)"); y = LETTER[1] - 60
+    c.showPage(); c.save()
+    return buffer.getvalue()
@@ -0,0 +1,181 @@
+"""ZIP → county → region → statewide rollup cube.
+
+Each level is aggregated once from the level below (counts summed, index
+columns averaged), scored once, and indexed once, so switching levels or
+drilling down is a dict lookup rather than a regroup of the raw rows. An
+appended week is aggregated on its own and folded into each level's series
+index and rolling risk state, so it costs O(entities), not O(history).
+
+Regions default to Minnesota's economic development regions; a
+`county_regions.csv` (columns `county`, `region`) in the data directory
+overrides or extends the mapping.
+"""
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .incremental import RollingRiskState
+from .paths import DATA_DIR
+from .scoring import DEFAULT_HORIZON, DEFAULT_THRESHOLDS, DEFAULT_WINDOW
+from .series import SeriesIndex
+from .storage import INDEX_COLS
+
+LEVELS = ["zip", "county", "region", "state"]  # finest first
+LEVEL_LABELS = {"zip": "ZIP", "county": "County", "region": "Region", "state": "Statewide"}
+STATE = "Minnesota"
+UNASSIGNED = "Unassigned"
+
+REGION_COUNTIES = {
+    "Region 1 — Northwest": ["Kittson", "Marshall", "Norman", "Pennington", "Polk", "Red Lake", "Roseau"],
+    "Region 2 — Headwaters": ["Beltrami", "Clearwater", "Hubbard", "Lake of the Woods", "Mahnomen"],
+    "Region 3 — Arrowhead": ["Aitkin", "Carlton", "Cook", "Itasca", "Koochiching", "Lake", "St. Louis"],
+    "Region 4 — West Central": ["Becker", "Clay", "Douglas", "Grant", "Otter Tail", "Pope", "Stevens", "Traverse",
+                                "Wilkin"],
+    "Region 5 — North Central": ["Cass", "Crow Wing", "Morrison", "Todd", "Wadena"],
+    "Region 6E — Southwest Central": ["Kandiyohi", "McLeod", "Meeker", "Renville"],
+    "Region 6W — Upper Minnesota Valley": ["Big Stone", "Chippewa", "Lac qui Parle", "Swift", "Yellow Medicine"],
+    "Region 7E — East Central": ["Chisago", "Isanti", "Kanabec", "Mille Lacs", "Pine"],
+    "Region 7W — Central": ["Benton", "Sherburne", "Stearns", "Wright"],
+    "Region 8 — Southwest": ["Cottonwood", "Jackson", "Lincoln", "Lyon", "Murray", "Nobles", "Pipestone", "Redwood",
+                             "Rock"],
+    "Region 9 — South Central": ["Blue Earth", "Brown", "Faribault", "Le Sueur", "Martin", "Nicollet", "Sibley",
+                                 "Waseca", "Watonwan"],
+    "Region 10 — Southeast": ["Dodge", "Fillmore", "Freeborn", "Goodhue", "Houston", "Mower", "Olmsted", "Rice",
+                              "Steele", "Wabasha", "Winona"],
+    "Region 11 — Metro": ["Anoka", "Carver", "Dakota", "Hennepin", "Ramsey", "Scott", "Washington"],
+}
+COUNTY_REGIONS = {f"{c} County": r for r, cs in REGION_COUNTIES.items() for c in cs}
+
+
+def county_regions_file(data_dir=DATA_DIR):
+    """The `county_regions.csv` that `county_regions` reads, or None; cache keys should include its digest."""
+    for d in (Path(data_dir), Path(".")):
+        path = d / "county_regions.csv"
+        if path.exists():
+            return path
+    return None
+
+
+def county_regions(data_dir=DATA_DIR):
+    """Built-in county → region map, updated from `county_regions.csv` when present."""
+    mapping = dict(COUNTY_REGIONS)
+    path = county_regions_file(data_dir)
+    if path is not None:
+        extra = pd.read_csv(path, dtype=str)
+        if {"county", "region"} <= set(extra.columns):
+            mapping.update(zip(extra["county"].str.strip(), extra["region"].str.strip()))
+    return mapping
+
+
+def region_of(counties, mapping):
+    """Region per county; numbered load-test copies ("X County (2)") inherit X's region."""
+    codes, uniq = pd.factorize(counties)
+    names = [mapping.get(str(c)) or mapping.get(re.sub(r" \(\d+\)$", "", str(c)), UNASSIGNED) for c in uniq]
+    return pd.Categorical(np.asarray(names, dtype=object)[codes])
+
+
+def measure_columns(df):
+    skip = {"date", *LEVELS}
+    return [c for c in df.columns if c not in skip and pd.api.types.is_numeric_dtype(df[c])]
+
+
+def aggregate(df, by, measures):
+    """One groupby per level: counts summed, index columns averaged, per (by..., date)."""
+    agg = {c: "mean" if c in INDEX_COLS else "sum" for c in measures}
+    out = df.groupby([*by, "date"], observed=True, sort=False)[measures].agg(agg).reset_index()
+    for c in measures:
+        if c not in INDEX_COLS and str(df[c].dtype).startswith("int"):
+            out[c] = out[c].astype(df[c].dtype)
+    return out
+
+
+def has_zip(df):
+    return "zip" in df.columns and df["zip"].notna().any()
+
+
+def county_level(weekly_df):
+    """County rows from a weekly frame that may hold ZIP rows; a no-op when it has none."""
+    if not has_zip(weekly_df):
+        return weekly_df.drop(columns=["zip"], errors="ignore")
+    return aggregate(weekly_df, ["county"], measure_columns(weekly_df))
+
+
+class RollupCube:
+    """Per-level weekly frames, overviews and series indexes, built once per data version.
+
+        cube = RollupCube(weekly)
+        cube.overview("region"); cube.get("zip", "55401"); cube.children("county", "Hennepin County")
+        cube.append(new_week_rows)  # incremental; same result as rebuilding from the concatenated history
+    """
+
+    def __init__(self, weekly_df, regions=None, window=DEFAULT_WINDOW, thresholds=DEFAULT_THRESHOLDS,
+                 horizon=DEFAULT_HORIZON):
+        self.regions = county_regions() if regions is None else regions
+        self.measures = measure_columns(weekly_df)
+        frames = self._frames(weekly_df)
+        self.levels = [lvl for lvl in LEVELS if lvl in frames]
+        self.index = {lvl: SeriesIndex(f, key=lvl) for lvl, f in frames.items()}
+        self.risk = {lvl: RollingRiskState.from_weekly(f, window=window, thresholds=thresholds, horizon=horizon, key=lvl)
+                     for lvl, f in frames.items()}
+        self.overviews = {lvl: self._overview(lvl) for lvl in self.levels}
+        # parent level -> {parent entity: sorted child entities}
+        self._children = {}
+        self._add_children(frames)
+
+    def _frames(self, weekly_df):
+        """Per-level weekly rows for `weekly_df` (the full history, or just an appended week)."""
+        weekly_df = weekly_df[weekly_df["county"].notna()]
+        frames = {}
+        if has_zip(weekly_df):
+            frames["zip"] = weekly_df[weekly_df["zip"].notna()]
+        county = county_level(weekly_df)
+        county = county.assign(region=region_of(county["county"], self.regions))
+        frames["county"] = county
+        frames["region"] = aggregate(county, ["region"], self.measures).assign(state=STATE)
+        frames["state"] = aggregate(county, [], self.measures).assign(state=STATE)
+        return frames
+
+    def _overview(self, level):
+        ov = self.risk[level].overview()
+        return ov.rename(columns={level: LEVEL_LABELS[level]}) if level != "county" else ov
+
+    def _add_children(self, frames):
+        for child, parent in (("zip", "county"), ("county", "region"), ("region", "state")):
+            if child in frames and len(frames[child]):
+                pairs = frames[child][[child, parent]].drop_duplicates()
+                known = self._children.setdefault(parent, {})
+                for p, g in pairs.groupby(parent, observed=True, sort=False)[child]:
+                    known[p] = sorted(set(known.get(p, ())) | set(map(str, g)))
+
+    def append(self, new_rows):
+        """Fold a new week's rows into every level; weeks not newer than an entity's last are ignored."""
+        frames = self._frames(new_rows)
+        added = 0
+        for lvl, f in frames.items():
+            if lvl not in self.index:
+                continue  # e.g. ZIP rows appended to a county-only history
+            added += self.index[lvl].append(f)
+            if self.risk[lvl].append(f):
+                self.overviews[lvl] = self._overview(lvl)
+        self._add_children({lvl: f for lvl, f in frames.items() if lvl in self.index})
+        return added
+
+    def frame(self, level):
+        """Weekly rows at `level` (one row per entity and week), sorted by entity and date."""
+        return self.index[level].frame
+
+    def overview(self, level):
+        """`make_overview` at `level`; the entity column is named by `LEVEL_LABELS`."""
+        return self.overviews[level]
+
+    def get(self, level, entity, columns=None):
+        return self.index[level].get(entity, columns)
+
+    def entities(self, level):
+        return self.index[level].keys()
+
+    def children(self, level, entity):
+        """Entities one level finer than `level` under `entity`."""
+        return list(self._children.get(level, {}).get(entity, []))
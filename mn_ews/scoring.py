@@ -0,0 +1,76 @@
+"""Vectorized spike-probability scoring for every county (or ZIP) in one pass."""
+import numpy as np
+import pandas as pd
+
+VALUE_COL = "Food_Shelf_Visits"
+DEFAULT_WINDOW = 8
+DEFAULT_HORIZON = 8
+DEFAULT_THRESHOLDS = (0.30, 0.60)  # (amber, red)
+NO_DATA = "No Data"  # RAG label when the probability is undefined (e.g. the latest week is missing)
+
+
+def rag_from_prob(p, thresholds=DEFAULT_THRESHOLDS):
+    """Map probabilities to Red/Amber/Green; Red is strictly above the red cutoff and NaN is `NO_DATA`."""
+    amber, red = thresholds
+    p = np.asarray(p, dtype=float)
+    return np.select([np.isnan(p), p > red, p >= amber], [NO_DATA, "Red", "Amber"], default="Green").astype(object)
+
+
+def spike_probability(last, mu, sd):
+    """Logistic of the z-score of the latest value; a zero/undefined std counts as 1."""
+    sd = np.where(np.asarray(sd, dtype=float) > 0, sd, 1.0)
+    z = (np.asarray(last, dtype=float) - mu) / sd
+    return z, 1.0 / (1.0 + np.exp(-z))
+
+
+def window_stats(codes, values, n_groups):
+    """Per-group mean and sample std of `values`, skipping NaN; also returns the valid counts."""
+    valid = ~np.isnan(values)
+    n = np.bincount(codes, weights=valid, minlength=n_groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mu = np.bincount(codes, weights=np.where(valid, values, 0.0), minlength=n_groups) / n
+        dev = np.where(valid, values - mu[codes], 0.0)
+        ss = np.bincount(codes, weights=dev * dev, minlength=n_groups)
+        sd = np.where(n > 1, np.sqrt(ss / (n - 1)), np.nan)
+    return mu, sd, n
+
+
+def _sorted_groups(weekly, key, value_col):
+    df = weekly[[key, "date", value_col]]
+    df = df[df[key].notna()].sort_values([key, "date"], kind="mergesort")
+    codes, uniques = pd.factorize(df[key], sort=False)
+    counts = np.bincount(codes, minlength=len(uniques))
+    ends = np.cumsum(counts)
+    return df, codes, np.asarray(uniques), counts, ends - counts, ends
+
+
+def score_weekly(weekly_df, window=DEFAULT_WINDOW, thresholds=DEFAULT_THRESHOLDS,
+                 horizon=DEFAULT_HORIZON, key="county", value_col=VALUE_COL):
+    """Score the last `window` weeks of every series at once.
+
+    Returns one row per entity with the rolling mean/std, z-score,
+    `Prob_Spike_8w`, `RAG_Status` and `Lead_Time_Weeks`. Missing values in
+    the window are skipped; a missing latest value scores NaN (`NO_DATA`).
+    """
+    df, codes, entities, counts, starts, ends = _sorted_groups(weekly_df, key, value_col)
+    x = df[value_col].to_numpy(dtype=float)
+    pos = np.arange(len(x)) - starts[codes]
+    keep = pos >= (counts - window)[codes]
+    mu, sd, _ = window_stats(codes[keep], x[keep], len(entities))
+    z, p = spike_probability(x[ends - 1], mu, sd)
+    out = pd.DataFrame({
+        "County" if key == "county" else key: entities,
+        "Rolling_Mean": mu, "Rolling_Std": sd, "Z_Score": z,
+        "Prob_Spike_8w": p,
+        "RAG_Status": rag_from_prob(p, thresholds),
+        "As_Of_Date": str(pd.to_datetime(df["date"]).max().date()) if len(df) else None,
+        "Lead_Time_Weeks": horizon,
+    })
+    return out.sort_values("Prob_Spike_8w", ascending=False, kind="mergesort").reset_index(drop=True)
+
+
+def make_overview(weekly_df, window=DEFAULT_WINDOW, thresholds=DEFAULT_THRESHOLDS,
+                  horizon=DEFAULT_HORIZON, key="county"):
+    """The `current_risk_overview` layout: entity, probability, RAG, as-of date, lead time."""
+    scored = score_weekly(weekly_df, window, thresholds, horizon, key=key)
+    return scored.drop(columns=["Rolling_Mean", "Rolling_Std", "Z_Score"])
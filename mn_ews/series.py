@@ -0,0 +1,75 @@
+"""Per-entity slice map over a weekly frame sorted once by (key, date)."""
+import numpy as np
+import pandas as pd
+
+
+def _slice_map(frame, key):
+    """{entity: slice} over a frame sorted by (key, date), plus each entity's last date as a Series."""
+    codes, uniques = pd.factorize(frame[key], sort=False)
+    counts = np.bincount(codes, minlength=len(uniques))
+    ends = np.cumsum(counts)
+    slices = {k: slice(int(s), int(e)) for k, s, e in zip(uniques, ends - counts, ends)}
+    dates = pd.to_datetime(frame["date"], cache=False).to_numpy(dtype="datetime64[ns]")
+    return slices, pd.Series(dates[ends - 1] if len(frame) else dates[:0], index=pd.Index(uniques, dtype=object))
+
+
+class SeriesIndex:
+    """Sort the weekly frame once; each county's series is then a contiguous `iloc` slice.
+
+    `get(county)` is a dict lookup plus a slice — no boolean scan, no re-sort.
+    `append(rows)` keeps newer weeks in a small sorted side frame with its own
+    slices, so an appended week costs O(appended rows), not O(history).
+    """
+
+    def __init__(self, weekly_df, key="county"):
+        self.key = key
+        df = weekly_df[weekly_df[key].notna()].sort_values([key, "date"], kind="mergesort")
+        self._frame = df.reset_index(drop=True)
+        self._slices, self._last = _slice_map(self._frame, key)
+        self._keys = sorted(self._slices, key=str)
+        self._extra, self._extra_slices = None, {}
+
+    @property
+    def frame(self):
+        """All rows sorted by (key, date); appended rows are merged in on first access."""
+        if self._extra is not None:
+            merged = pd.concat([self._frame, self._extra], ignore_index=True)
+            self._frame = merged.sort_values([self.key, "date"], kind="mergesort").reset_index(drop=True)
+            self._slices, _ = _slice_map(self._frame, self.key)
+            self._extra, self._extra_slices = None, {}
+        return self._frame
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, entity):
+        return entity in self._last.index
+
+    def keys(self):
+        return list(self._keys)
+
+    def get(self, entity, columns=None):
+        df = self._frame.iloc[self._slices.get(entity, slice(0, 0))]
+        extra = self._extra_slices.get(entity)
+        if extra is not None:
+            df = pd.concat([df, self._extra.iloc[extra]], ignore_index=True)
+        return df if columns is None else df[columns]
+
+    def append(self, new_rows):
+        """Add rows newer than each entity's last week (older or repeated weeks are ignored); returns rows kept."""
+        key = self.key
+        rows = new_rows[new_rows[key].notna()]
+        rows = rows.assign(date=pd.to_datetime(rows["date"], cache=False)).drop_duplicates([key, "date"], keep="last")
+        last = rows[key].astype(object).map(self._last).to_numpy(dtype="datetime64[ns]")
+        rows = rows[np.isnat(last) | (rows["date"].to_numpy(dtype="datetime64[ns]") > last)]
+        if rows.empty:
+            return 0
+        rows = rows.reindex(columns=self._frame.columns) if len(self._frame.columns) else rows
+        extra = rows if self._extra is None else pd.concat([self._extra, rows], ignore_index=True)
+        self._extra = extra.sort_values([key, "date"], kind="mergesort").reset_index(drop=True)
+        self._extra_slices, extra_last = _slice_map(self._extra, key)
+        fresh = ~extra_last.index.isin(self._last.index)
+        self._last = pd.concat([self._last.drop(extra_last.index[~fresh]), extra_last])
+        if fresh.any():
+            self._keys = sorted(self._last.index, key=str)
+        return len(rows)
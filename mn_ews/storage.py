@@ -0,0 +1,161 @@
+"""Typed schemas and a Parquet-first store for the weekly inputs and snapshot files.
+
+Convert once, then the loader prefers `<name>.parquet` over `<name>.csv`:
+
+    python -m mn_ews.storage data/synthetic_weekly_inputs_minnesota.csv data/mn_latest_snapshot_with_RAG.csv
+"""
+import argparse
+import sys
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+COUNT_COLS = ["SNAP_Applications", "SNAP_Active_Cases", "NSLP_SBP_Participation", "Food_Shelf_Visits",
+              "Unemployment_Claims", "Eviction_Filings", "Utility_Shutoffs"]
+INDEX_COLS = ["CPI_Food_At_Home_Index", "Drought_Severity_Index", "Household_Pulse_Food_Insufficiency_Pct"]
+
+OPTIONAL_COLS = ["zip"]  # sub-county key; rows without it are county-level rows
+
+WEEKLY_SCHEMA = {"date": "datetime64[ns]", "county": "category", "zip": "category",
+                 **{c: "int32" for c in COUNT_COLS}, **{c: "float32" for c in INDEX_COLS}}
+SNAPSHOT_SCHEMA = {**WEEKLY_SCHEMA, "Prob_Spike_8w": "float64", "RAG_Status": "category", "Lead_Time_Weeks": "int16"}
+OVERVIEW_SCHEMA = {"County": "category", "As_Of_Date": "object", "Prob_Spike_8w": "float64",
+                   "RAG_Status": "category", "Lead_Time_Weeks": "int16"}
+
+SCHEMAS = {
+    "synthetic_weekly_inputs_minnesota": WEEKLY_SCHEMA,
+    "mn_latest_snapshot_with_RAG": SNAPSHOT_SCHEMA,
+    "current_risk_overview_minnesota": OVERVIEW_SCHEMA,
+}
+
+
+def schema_for(name):
+    return SCHEMAS.get(Path(str(name)).stem)
+
+
+def has_arrow():
+    try:
+        import pyarrow.parquet  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def apply_schema(df, schema):
+    """Cast the columns present in `df`; integer columns with gaps fall back to float32.
+
+    Integer columns holding fractional or out-of-range values stay float64,
+    with a warning, rather than wrapping around.
+    """
+    if not schema:
+        return df
+    for col, dtype in schema.items():
+        if col not in df.columns or str(df[col].dtype) == dtype:
+            continue
+        if dtype.startswith("datetime"):
+            if not pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = pd.to_datetime(df[col], errors="coerce")
+        elif dtype.startswith("int"):
+            s = pd.to_numeric(df[col], errors="coerce")
+            info = np.iinfo(dtype)
+            fits = s.isna() | ((s >= info.min) & (s <= info.max) & (s % 1 == 0))
+            if not fits.all():
+                # Casting would wrap or truncate; keep exact values as float64 instead.
+                warnings.warn(f"{col}: {int((~fits).sum()):,} value(s) are not whole numbers within {dtype}; "
+                              "kept as float64", stacklevel=2)
+                df[col] = s.astype("float64")
+            else:
+                df[col] = s.astype(dtype) if s.notna().all() else s.astype("float32")
+        elif dtype.startswith("float"):
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype(dtype)
+        else:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def read_csv_typed(src, schema=None, columns=None):
+    """Read a CSV straight into the typed schema, parsing only `columns` when given."""
+    usecols = None if columns is None else (lambda c: c in set(columns))
+    if schema is None:
+        return pd.read_csv(src, usecols=usecols)
+    # Integers parse as int64 so `apply_schema` can range-check them; a direct int32 parse wraps around.
+    dtype = {c: "int64" if t.startswith("int") else t for c, t in schema.items() if not t.startswith("datetime")}
+    pos = src.tell() if hasattr(src, "tell") else None
+    try:
+        df = pd.read_csv(src, usecols=usecols, dtype=dtype)
+    except (ValueError, TypeError):
+        # Missing counts or stray text: read untyped, then coerce column by column.
+        if pos is not None:
+            src.seek(pos)
+        df = pd.read_csv(src, usecols=usecols)
+    return apply_schema(df, schema)
+
+
+def read_parquet(path, columns=None, memory_map=True):
+    import pyarrow.parquet as pq
+    if columns is not None:
+        names = set(pq.read_schema(path).names)
+        columns = [c for c in columns if c in names]
+    table = pq.read_table(path, columns=columns, memory_map=memory_map)
+    return apply_schema(table.to_pandas(), schema_for(path))
+
+
+def find_table(relpath, search_dirs):
+    """First `<stem>.parquet` or `<relpath>` found across `search_dirs`, in order.
+
+    The Parquet copy wins only while it is at least as new as the CSV next to
+    it; a CSV edited after conversion is read instead, with a warning.
+    """
+    rel = Path(relpath)
+    for d in search_dirs:
+        base = Path(d) / rel
+        pq_path = base.with_suffix(".parquet")
+        if pq_path.exists() and has_arrow():
+            if not base.exists() or pq_path.stat().st_mtime_ns >= base.stat().st_mtime_ns:
+                return pq_path
+            warnings.warn(f"{pq_path} is older than {base}; reading the CSV. "
+                          f"Re-run `python -m mn_ews.storage {base}` to refresh it.", stacklevel=2)
+            return base
+        if base.exists():
+            return base
+    return None
+
+
+def read_table(relpath, search_dirs, columns=None, memory_map=True):
+    path = find_table(relpath, search_dirs)
+    if path is None:
+        return None
+    if path.suffix == ".parquet":
+        return read_parquet(path, columns=columns, memory_map=memory_map)
+    return read_csv_typed(path, schema_for(path), columns=columns)
+
+
+def write_parquet(df, path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, compression="zstd")
+    return Path(path)
+
+
+def convert_csv_to_parquet(csv_path, parquet_path=None):
+    csv_path = Path(csv_path)
+    df = read_csv_typed(csv_path, schema_for(csv_path))
+    return write_parquet(df, parquet_path or csv_path.with_suffix(".parquet"))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Convert EWS CSV inputs to typed Parquet files.")
+    ap.add_argument("csv", nargs="+", help="CSV files; each is written next to itself as .parquet")
+    args = ap.parse_args(argv)
+    if not has_arrow():
+        sys.exit("pyarrow is required for Parquet conversion (pip install pyarrow)")
+    for p in args.csv:
+        out = convert_csv_to_parquet(p)
+        mb_in, mb_out = Path(p).stat().st_size / 1e6, out.stat().st_size / 1e6
+        print(f"{p} -> {out} ({mb_in:.2f} MB -> {mb_out:.2f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Vectorized synthetic weekly inputs for demos and load tests.
+
+Every column is built as an (entities x weeks) array in one shot, in the same
+schema as `synthetic_weekly_inputs_minnesota.csv`. Large runs can stream
+straight to disk in entity chunks:
+
+    python -m mn_ews.synthetic --entities 87 --weeks 520 --out data/synthetic_weekly_inputs_minnesota.parquet
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+MN_COUNTIES = [
+    "Hennepin County", "Ramsey County", "St. Louis County",  # the embedded example trio comes first
+    "Aitkin County", "Anoka County", "Becker County", "Beltrami County", "Benton County", "Big Stone County",
+    "Blue Earth County", "Brown County", "Carlton County", "Carver County", "Cass County", "Chippewa County",
+    "Chisago County", "Clay County", "Clearwater County", "Cook County", "Cottonwood County", "Crow Wing County",
+    "Dakota County", "Dodge County", "Douglas County", "Faribault County", "Fillmore County", "Freeborn County",
+    "Goodhue County", "Grant County", "Houston County", "Hubbard County", "Isanti County", "Itasca County",
+    "Jackson County", "Kanabec County", "Kandiyohi County", "Kittson County", "Koochiching County",
+    "Lac qui Parle County", "Lake County", "Lake of the Woods County", "Le Sueur County", "Lincoln County",
+    "Lyon County", "McLeod County", "Mahnomen County", "Marshall County", "Martin County", "Meeker County",
+    "Mille Lacs County", "Morrison County", "Mower County", "Murray County", "Nicollet County", "Nobles County",
+    "Norman County", "Olmsted County", "Otter Tail County", "Pennington County", "Pine County",
+    "Pipestone County", "Polk County", "Pope County", "Red Lake County", "Redwood County", "Renville County",
+    "Rice County", "Rock County", "Roseau County", "Scott County", "Sherburne County", "Sibley County",
+    "Stearns County", "Steele County", "Stevens County", "Swift County", "Todd County", "Traverse County",
+    "Wabasha County", "Wadena County", "Waseca County", "Washington County", "Watonwan County",
+    "Wilkin County", "Winona County", "Wright County", "Yellow Medicine County",
+]
+
+COLUMNS = ["date", "county", "SNAP_Applications", "SNAP_Active_Cases", "NSLP_SBP_Participation",
+           "Food_Shelf_Visits", "Unemployment_Claims", "CPI_Food_At_Home_Index", "Eviction_Filings",
+           "Utility_Shutoffs", "Drought_Severity_Index", "Household_Pulse_Food_Insufficiency_Pct"]
+
+
+def entity_names(n):
+    """The 87 Minnesota counties, then numbered repeats for load tests beyond that."""
+    k = len(MN_COUNTIES)
+    return [MN_COUNTIES[i] if i < k else f"{MN_COUNTIES[i % k]} ({i // k + 1})" for i in range(n)]
+
+
+def zip_codes(n):
+    """Synthetic five-digit ZIP labels from the Minnesota 55001 range upward."""
+    return [f"{55001 + i:05d}" for i in range(n)]
+
+
+def week_dates(n_weeks, end=None):
+    end = pd.Timestamp.today().normalize() if end is None else pd.Timestamp(end)
+    return pd.date_range(end - pd.Timedelta(weeks=n_weeks), periods=n_weeks, freq="W")
+
+
+def _season(n_weeks, season_period):
+    if season_period is None:  # two cycles across the span, as in the original embedded example
+        return (np.sin(np.linspace(0, 4*np.pi, n_weeks)) + 1)/2
+    return (np.sin(2*np.pi*np.arange(n_weeks)/season_period) + 1)/2
+
+
+def _shock_effect(rng, shape, shock_prob, shock_weeks):
+    """0/1 mask of weeks inside a shock episode; starts are Bernoulli(shock_prob)."""
+    starts = rng.random(shape) < shock_prob
+    effect = np.zeros(shape, dtype=bool)
+    for lag in range(shock_weeks):
+        effect[:, lag:] |= starts[:, :shape[1] - lag]
+    return effect
+
+
+def _block(rng, names, categories, weeks, season_amplitude, season_period,
+           shock_prob, shock_scale, shock_weeks, shock_lead):
+    G, T = len(names), len(weeks)
+    season = season_amplitude * _season(T, season_period)
+    base = lambda lo, hi: rng.integers(lo, hi, G)[:, None]
+    noise = lambda sd: rng.normal(0, sd, (G, T))
+    snap_apps = base(300, 600) + 40*season + noise(15)
+    snap_cases = base(5000, 12000) + 200*season + noise(60)
+    school_meals = base(8000, 20000) + 1500*(1-season) + noise(250)
+    pantry_visits = base(700, 1400) + 120*season + noise(35)
+    unemp_claims = base(500, 2000) + 80*season + noise(25)
+    cpi_food = (250 + rng.uniform(-5, 5, G))[:, None] + np.linspace(0, 5, T) + noise(0.5)
+    if shock_prob > 0:
+        # Economic shocks lift claims/applications first and pantry visits `shock_lead` weeks later.
+        shock = _shock_effect(rng, (G, T), shock_prob, shock_weeks)
+        lagged = np.zeros_like(shock)
+        lagged[:, shock_lead:] = shock[:, :T - shock_lead] if shock_lead else shock
+        unemp_claims *= 1 + shock_scale*shock
+        snap_apps *= 1 + shock_scale*shock
+        pantry_visits *= 1 + shock_scale*lagged
+    counts = lambda x: np.maximum(0, np.rint(x)).astype(np.int32).ravel()
+    cols = {
+        "date": np.tile(weeks.to_numpy(), G),
+        "county": pd.Categorical.from_codes(np.repeat(categories.get_indexer(names), T), categories=categories),
+        "SNAP_Applications": counts(snap_apps),
+        "SNAP_Active_Cases": counts(snap_cases),
+        "NSLP_SBP_Participation": counts(school_meals),
+        "Food_Shelf_Visits": counts(pantry_visits),
+        "Unemployment_Claims": counts(unemp_claims),
+        "CPI_Food_At_Home_Index": cpi_food.astype(np.float32).ravel(),
+        "Eviction_Filings": rng.integers(5, 30, (G, T), dtype=np.int32).ravel(),
+        "Utility_Shutoffs": rng.integers(10, 45, (G, T), dtype=np.int32).ravel(),
+        "Drought_Severity_Index": np.tile(np.clip(0.4 + 0.2*np.sin(np.arange(T)/8), 0, 1), G).astype(np.float32),
+        "Household_Pulse_Food_Insufficiency_Pct": (6 + 2*season + noise(0.4)).astype(np.float32).ravel(),
+    }
+    return pd.DataFrame(cols, columns=COLUMNS)
+
+
+def iter_weekly_chunks(n_entities=3, n_weeks=60, seed=42, chunk_entities=None, end=None,
+                       season_amplitude=1.0, season_period=None, shock_prob=0.0, shock_scale=0.25,
+                       shock_weeks=4, shock_lead=3, names=None, zips_per_entity=0):
+    """Yield weekly frames covering `chunk_entities` series each.
+
+    With `zips_per_entity`, every county is split into that many ZIP series
+    (a `zip` column after `county`) and chunks count ZIPs rather than counties.
+    A single chunk draws from `default_rng(seed)`; multiple chunks use child
+    seeds spawned from `seed`, so output is deterministic for a given
+    (seed, chunk_entities).
+    """
+    names = list(names) if names is not None else entity_names(n_entities)
+    counties = pd.Index(names)
+    series = zip_codes(len(names) * zips_per_entity) if zips_per_entity else names
+    parent = np.repeat(np.arange(len(names)), zips_per_entity) if zips_per_entity else None
+    categories = pd.Index(series)
+    weeks = week_dates(n_weeks, end)
+    step = chunk_entities or len(series) or 1
+    bounds = range(0, len(series), step)
+    rngs = ([np.random.default_rng(seed)] if len(bounds) <= 1 else
+            [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(len(bounds))])
+    for rng, lo in zip(rngs, bounds):
+        df = _block(rng, series[lo:lo + step], categories, weeks, season_amplitude, season_period,
+                    shock_prob, shock_scale, shock_weeks, shock_lead)
+        if zips_per_entity:
+            df = df.rename(columns={"county": "zip"})
+            codes = np.repeat(parent[lo:lo + step], len(weeks))
+            df.insert(1, "county", pd.Categorical.from_codes(codes, categories=counties))
+        yield df
+
+
+def generate_weekly(n_entities=3, n_weeks=60, seed=42, **kwargs):
+    """In-memory synthetic history; see `iter_weekly_chunks` for the parameters."""
+    chunks = list(iter_weekly_chunks(n_entities, n_weeks, seed, **kwargs))
+    return chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+
+
+def write_weekly(path, n_entities=87, n_weeks=520, seed=42, chunk_entities=500, **kwargs):
+    """Stream synthetic history to CSV or Parquet (by suffix) without holding it all in memory."""
+    path = Path(path)
+    chunks = iter_weekly_chunks(n_entities, n_weeks, seed, chunk_entities=chunk_entities, **kwargs)
+    rows = 0
+    if path.suffix == ".parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        writer = None
+        try:
+            for df in chunks:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                writer = writer or pq.ParquetWriter(path, table.schema, compression="zstd")
+                writer.write_table(table)
+                rows += len(df)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        for i, df in enumerate(chunks):
+            df.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False, date_format="%Y-%m-%d")
+            rows += len(df)
+    return rows
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate synthetic weekly EWS inputs at any scale.")
+    ap.add_argument("--entities", type=int, default=87)
+    ap.add_argument("--weeks", type=int, default=520)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--chunk", type=int, default=500, help="entities per chunk written")
+    ap.add_argument("--season-period", type=float, default=52, help="weeks per seasonal cycle")
+    ap.add_argument("--shock-prob", type=float, default=0.01, help="weekly chance a shock starts per entity")
+    ap.add_argument("--shock-scale", type=float, default=0.25)
+    ap.add_argument("--zips-per-county", type=int, default=0, help="split each county into this many ZIP series")
+    ap.add_argument("--out", required=True, help=".csv or .parquet path")
+    args = ap.parse_args(argv)
+    rows = write_weekly(args.out, args.entities, args.weeks, args.seed, chunk_entities=args.chunk,
+                        season_period=args.season_period, shock_prob=args.shock_prob, shock_scale=args.shock_scale,
+                        zips_per_entity=args.zips_per_county)
+    print(f"Wrote {rows:,} rows ({args.entities} entities x {args.weeks} weeks) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
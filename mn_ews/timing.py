@@ -0,0 +1,46 @@
+"""Lightweight per-stage wall-clock timing for app reruns, batch jobs and benchmarks."""
+import time
+from contextlib import contextmanager
+
+
+class StageTimer:
+    """Collects (stage, seconds) pairs; repeated stages accumulate.
+
+        timer = StageTimer()
+        with timer.stage("score"):
+            make_overview(weekly)
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.calls = {}
+
+    @contextmanager
+    def stage(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def add(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def total(self):
+        return time.perf_counter() - self.started
+
+    def rows(self):
+        return [{"stage": k, "ms": round(v * 1000, 2), "calls": self.calls[k]} for k, v in self.stages.items()]
+
+
+def best_of(fn, repeat=3):
+    """(best, median) seconds over `repeat` calls of `fn()`."""
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t0)
+    runs.sort()
+    return runs[0], runs[len(runs) // 2]
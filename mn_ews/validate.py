@@ -0,0 +1,214 @@
+"""Streaming validation for uploaded weekly CSVs.
+
+The header is checked before any data is parsed, so a file missing a required
+column fails immediately. Rows are then read in chunks as text, coerced to the
+typed schema one chunk at a time, and kept only in their typed form; bad
+values are reported with their CSV line numbers.
+
+    weekly, report = validate_csv(upload, required=required_columns(metrics_ref))
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from .scoring import VALUE_COL
+from .storage import OPTIONAL_COLS, WEEKLY_SCHEMA
+
+DEFAULT_CHUNKSIZE = 50_000
+MAX_REPORTED = 1000
+
+
+class SchemaError(ValueError):
+    """The upload cannot be used at all (missing columns, unreadable header, mostly malformed rows)."""
+
+
+class ValidationReport:
+    """Outcome of `validate_csv`: row counts, ignored columns and the first `MAX_REPORTED` problems."""
+
+    def __init__(self):
+        self.rows_read = 0
+        self.rows_kept = 0
+        self.ignored_columns = []
+        self.problems = []  # {"line", "column", "value", "problem"}
+        self.problem_count = 0
+
+    def add(self, lines, column, values, problem):
+        self.problem_count += len(lines)
+        room = MAX_REPORTED - len(self.problems)
+        for line, value in zip(lines[:max(room, 0)], values[:max(room, 0)]):
+            self.problems.append({"line": int(line), "column": column, "value": value, "problem": problem})
+
+    @property
+    def ok(self):
+        return self.problem_count == 0
+
+    def frame(self):
+        return pd.DataFrame(self.problems, columns=["line", "column", "value", "problem"])
+
+    def summary(self):
+        msg = f"{self.rows_kept:,} of {self.rows_read:,} rows loaded"
+        if self.problem_count:
+            msg += f"; {self.problem_count:,} bad value(s), first on line {self.problems[0]['line']}"
+        if self.ignored_columns:
+            msg += f"; ignored columns: {', '.join(self.ignored_columns)}"
+        return msg
+
+
+def required_columns(metrics_ref=None, schema=WEEKLY_SCHEMA, value_col=VALUE_COL):
+    """`date`, `county`, the outcome column and every metrics-reference metric that is a weekly column."""
+    req = ["date", "county", value_col]
+    if metrics_ref is not None and "Metric" in metrics_ref.columns:
+        req += [m for m in metrics_ref["Metric"].dropna().astype(str) if m in schema and m not in req]
+    return req
+
+
+def _parse_dates(raw):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        out = pd.to_datetime(raw, format="ISO8601", errors="coerce")
+        retry = out.isna() & raw.notna()
+        if retry.any():
+            out[retry] = pd.to_datetime(raw[retry], format="mixed", errors="coerce")
+    return out
+
+
+def _physical_lines(chunk, first_line):
+    """CSV line number of each row and the mask of blank rows, for a chunk read with skip_blank_lines=False.
+
+    Quoted fields may span lines, so each row advances by one plus the
+    newlines inside its fields.
+    """
+    present = chunk.notna().to_numpy()
+    # an empty line reads as all-missing; a whitespace-only one leaves text in the first column only
+    blank = ~present[:, 1:].any(axis=1) if chunk.shape[1] > 1 else np.ones(len(chunk), dtype=bool)
+    if blank.any():
+        first = chunk.iloc[:, 0][blank]
+        blank[np.flatnonzero(blank)] = (first.isna() | first.str.strip().eq("")).to_numpy()
+    extra = np.zeros(len(chunk), dtype=np.int64)
+    for col in chunk.columns:
+        multi = chunk[col].str.contains("\n", regex=False, na=False).to_numpy()
+        if multi.any():
+            extra[multi] += chunk[col][multi].str.count("\n").to_numpy(dtype=np.int64)
+    starts = first_line + np.arange(len(chunk)) + np.concatenate([[0], np.cumsum(extra)[:-1]])
+    return starts, blank, first_line + len(chunk) + int(extra.sum())
+
+
+def _coerce_chunk(chunk, schema, lines, report):
+    """Typed columns for one text chunk (`lines` are its CSV line numbers), plus the mask of rows to keep."""
+    keep = np.ones(len(chunk), dtype=bool)
+    cols = {}
+    for col, dtype in schema.items():
+        if col not in chunk.columns:
+            continue
+        raw = chunk[col].str.strip().replace("", np.nan)
+        if col == "county":
+            bad = raw.isna().to_numpy()
+            report.add(lines[bad], col, [None] * int(bad.sum()), "missing county")
+            keep &= ~bad
+            cols[col] = raw
+            continue
+        if dtype.startswith("datetime"):
+            val = _parse_dates(raw)
+        elif dtype.startswith(("int", "float")):
+            val = pd.to_numeric(raw, errors="coerce")
+        else:
+            cols[col] = raw.astype(dtype)
+            continue
+        bad = (val.isna() & raw.notna()).to_numpy()
+        if bad.any():
+            report.add(lines[bad], col, raw[bad].tolist(), f"not a valid {dtype.rstrip('[ns]0123456789')}")
+        if dtype.startswith("int"):
+            # Checked before the downcast, which would otherwise wrap or truncate these silently.
+            info = np.iinfo(dtype)
+            wide = ((val < info.min) | (val > info.max)).to_numpy()
+            frac = (val.notna() & (val % 1 != 0)).to_numpy() & ~wide
+            if wide.any():
+                report.add(lines[wide], col, raw[wide].tolist(), f"out of range for {dtype}")
+            if frac.any():
+                report.add(lines[frac], col, raw[frac].tolist(), "not a whole number")
+            if wide.any() or frac.any():
+                val = val.mask(wide | frac)
+        if dtype.startswith("datetime"):
+            missing = val.isna().to_numpy()
+            report.add(lines[missing & ~bad], col, [None] * int((missing & ~bad).sum()), "missing date")
+            keep &= ~missing
+        cols[col] = val
+    return cols, keep
+
+
+def _downcast(s, dtype):
+    if dtype.startswith("int"):
+        return s.astype(dtype) if s.notna().all() else s.astype("float32")
+    if dtype.startswith("float"):
+        return s.astype(dtype)
+    return s
+
+
+def validate_csv(src, schema=WEEKLY_SCHEMA, required=None, chunksize=DEFAULT_CHUNKSIZE, max_bad_fraction=0.5):
+    """Validate and load a CSV (path or file-like) in chunks; returns (typed frame, ValidationReport).
+
+    Raises `SchemaError` before reading any rows when required columns are
+    missing, and after the first chunk when more than `max_bad_fraction` of
+    its rows are unusable. Rows without a county or a parseable date are
+    dropped; other bad values (text such as "NA", fractional or out-of-range
+    counts) are reported and become missing.
+    """
+    required = [c for c in schema if c not in OPTIONAL_COLS] if required is None else list(required)
+    report = ValidationReport()
+    pos = src.tell() if hasattr(src, "tell") else None
+    try:
+        header = pd.read_csv(src, nrows=0).columns
+    except (ValueError, pd.errors.ParserError, UnicodeDecodeError) as e:
+        raise SchemaError(f"Could not read the CSV header: {e}") from e
+    header = [str(c).strip() for c in header]
+    missing = [c for c in required if c not in header]
+    if missing:
+        raise SchemaError(f"Missing required column(s): {', '.join(missing)}")
+    report.ignored_columns = [c for c in header if c not in schema]
+    if pos is not None:
+        src.seek(pos)
+
+    use = [c for c in header if c in schema]
+    parts = {c: [] for c in use}
+    mixed = set()
+    first_line = 2  # line 1 is the header
+    # All columns and blank lines are read so line numbers match the file; blank rows are then dropped unreported.
+    # Only empty fields are missing: "NA", "null" etc. stay text so they are reported, not silently dropped.
+    reader = pd.read_csv(src, dtype=str, chunksize=chunksize, skip_blank_lines=False,
+                         keep_default_na=False, na_values=[""])
+    for i, chunk in enumerate(reader):
+        chunk.columns = [str(c).strip() for c in chunk.columns]
+        lines, blank, first_line = _physical_lines(chunk, first_line)
+        if blank.any():
+            chunk, lines = chunk[~blank], lines[~blank]
+        chunk = chunk[use]
+        n = len(chunk)
+        cols, keep = _coerce_chunk(chunk, schema, lines, report)
+        del chunk
+        report.rows_read += n
+        if i == 0 and n and (~keep).sum() > max_bad_fraction * n:
+            raise SchemaError(f"{int((~keep).sum()):,} of the first {n:,} rows have no usable date or county; "
+                              "check the date format and column order")
+        for col in use:
+            s = _downcast(cols[col][keep], schema[col])
+            if schema[col] == "category":
+                s = s.astype("category")
+            elif schema[col].startswith("int") and s.dtype != schema[col]:
+                mixed.add(col)
+            parts[col].append(s.reset_index(drop=True))
+        report.rows_kept += int(keep.sum())
+
+    # Assemble column by column so peak memory stays near one typed copy plus one column.
+    out = {}
+    for col in use:
+        chunks = parts.pop(col)
+        if schema[col] == "category":
+            out[col] = pd.Series(union_categoricals(chunks) if chunks else pd.Categorical([]), name=col)
+        elif col in mixed:
+            out[col] = pd.concat([s.astype("float32") for s in chunks], ignore_index=True)
+        else:
+            out[col] = (pd.concat(chunks, ignore_index=True) if chunks
+                        else pd.Series([], dtype=schema[col] if not schema[col].startswith("datetime") else "datetime64[ns]"))
+    return pd.DataFrame(out, columns=use), report